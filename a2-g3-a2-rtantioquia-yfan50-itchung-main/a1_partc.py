@@ -1,6 +1,61 @@
 #    Main Author(s):  Yuhong Fan
 #    Main Reviewer(s): In Tae Chung
 
+import sys
+import threading
+from array import array
+from queue import Empty, Full
+
+
+def _shrink_if_sparse(container):
+    """
+    Halves a container's capacity once it is at most a quarter full, if its shrink policy is enabled.
+    The capacity never drops below the capacity the container was created with.
+
+    :param container: A Stack, Queue or Deque (or variant).
+    """
+    if container.shrink and container.cap > container.min_cap and container.n <= container.cap // 4:
+        container.resize(max(container.cap // 2, container.min_cap))
+
+
+def _deep_sizeof(obj, seen):
+    """
+    Returns the size in bytes of an object plus everything reachable through its list, tuple and dict contents,
+    counting each object only once.
+
+    :param obj: The object to measure.
+    :param seen: Set of ids of objects already counted.
+    :return: Integer size in bytes.
+    """
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple)):
+        for item in obj:
+            size += _deep_sizeof(item, seen)
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            size += _deep_sizeof(key, seen) + _deep_sizeof(value, seen)
+    return size
+
+
+def _memory_usage(container, live_items, deep):
+    """
+    Returns the bytes used by a container object and its storage, optionally including the live items.
+
+    :param container: The container being measured.
+    :param live_items: Iterable over the items currently stored.
+    :param deep: If True, also count the stored items (and, for boards, their rows).
+    :return: Integer size in bytes.
+    """
+    size = sys.getsizeof(container) + sys.getsizeof(container.items)
+    if deep:
+        seen = set()
+        for item in live_items:
+            size += _deep_sizeof(item, seen)
+    return size
+
 
 # Stack Class Implementation
 class Stack:
@@ -9,12 +64,17 @@ class Stack:
     Prohibited operations: append(), pop(), insert().
     """
 
-    def __init__(self, cap = 10): # Add a default capacity
+    _empty = None  # Value written into slots that no longer hold an item
+
+    def __init__(self, cap = 10, shrink = False): # Add a default capacity
         """
         Initializes a new stack with a specified capacity.
         
         :param cap: Integer representing the stack's capacity.
+        :param shrink: If True, halve the capacity whenever the stack drops to a quarter full (never below cap).
         """
+        self.shrink = shrink  # Shrink-when-quarter-full policy
+        self.min_cap = cap  # Capacity the stack never shrinks below
         self.items = [None] * cap  # Underlying storage for stack items
         self.n = 0  # Number of items currently in the stack
         self.cap = cap  # Total capacity of the stack
@@ -48,7 +108,10 @@ class Stack:
         if self.n == 0:
             raise IndexError('pop() used on empty stack')
         self.n -= 1
-        return self.items[self.n]
+        item = self.items[self.n]
+        self.items[self.n] = self._empty  # Release the reference so the item can be freed
+        _shrink_if_sparse(self)
+        return item
 
     def get_top(self):
         """
@@ -74,6 +137,15 @@ class Stack:
         """
         return self.n
 
+    def memory_usage(self, deep = False):
+        """
+        Returns the number of bytes used by the stack and its storage.
+        
+        :param deep: If True, also count the items currently on the stack.
+        :return: Integer size in bytes.
+        """
+        return _memory_usage(self, (self.items[i] for i in range(self.n)), deep)
+
     def resize(self, new_cap):
         """
         Resizes the stack's capacity.
@@ -93,12 +165,17 @@ class Queue:
     Prohibited operations: append(), pop(), insert().
     """
 
-    def __init__(self, cap = 10): # Add a default capacity
+    _empty = None  # Value written into slots that no longer hold an item
+
+    def __init__(self, cap = 10, shrink = False): # Add a default capacity
         """
         Initializes a new queue with a specified capacity.
         
         :param cap: Integer representing the queue's capacity.
+        :param shrink: If True, halve the capacity whenever the queue drops to a quarter full (never below cap).
         """
+        self.shrink = shrink  # Shrink-when-quarter-full policy
+        self.min_cap = cap  # Capacity the queue never shrinks below
         self.items = [None] * cap  # Underlying storage for queue items
         self.n = 0  # Number of items currently in the queue
         self.front = 0  # Index of the front item
@@ -134,8 +211,10 @@ class Queue:
         if self.n == 0:
             raise IndexError('dequeue() used on empty queue')
         item = self.items[self.front]
+        self.items[self.front] = self._empty  # Release the reference so the item can be freed
         self.front = (self.front + 1) % self.cap  # Move front pointer forward
         self.n -= 1
+        _shrink_if_sparse(self)
         return item
 
     def get_front(self):
@@ -162,6 +241,15 @@ class Queue:
         """
         return self.n
 
+    def memory_usage(self, deep = False):
+        """
+        Returns the number of bytes used by the queue and its storage.
+        
+        :param deep: If True, also count the items currently in the queue.
+        :return: Integer size in bytes.
+        """
+        return _memory_usage(self, (self.items[(self.front + i) % self.cap] for i in range(self.n)), deep)
+
     def resize(self, new_cap):
         """
         Resizes the queue's capacity.
@@ -175,6 +263,133 @@ class Queue:
         self.front = 0
         self.cap = new_cap
 
+# Blocking Queue Class Implementation
+class QueueClosed(Exception):
+    """
+    Raised by BlockingQueue when putting into a closed queue, or getting from a queue that is closed and drained
+    (or cancelled).
+    """
+
+
+class BlockingQueue(Queue):
+    """
+    A thread-safe queue with an optional maximum size, blocking put()/get() with timeouts and close/cancel
+    semantics, for handing results from worker threads to a consumer such as the pygame loop.
+    Timeouts raise queue.Full / queue.Empty like the standard library queue.
+    """
+
+    def __init__(self, maxsize = None, cap = 10, shrink = False):
+        """
+        Initializes a new blocking queue.
+
+        :param maxsize: Maximum number of items held at once, or None for no limit.
+        :param cap: Integer representing the initial storage capacity.
+        :param shrink: If True, halve the capacity whenever the queue drops to a quarter full (never below cap).
+        """
+        if maxsize is not None:
+            cap = max(1, min(cap, maxsize))  # No point allocating more slots than can ever be used
+        super().__init__(cap, shrink)
+        self.maxsize = maxsize
+        self.closed = False  # No more puts accepted; gets drain what is left
+        self.cancelled = False  # Remaining items were discarded
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def put(self, data, block = True, timeout = None):
+        """
+        Adds an item to the back of the queue, waiting for space if the queue is at its maximum size.
+
+        :param data: The item to be added to the queue.
+        :param block: If False, fail immediately instead of waiting for space.
+        :param timeout: Maximum number of seconds to wait, or None to wait indefinitely.
+        :raises queue.Full: If no space became available in time.
+        :raises QueueClosed: If the queue is (or becomes) closed.
+        """
+        with self._not_full:
+            if self.maxsize is not None:
+                has_space = lambda: self.n < self.maxsize or self.closed
+                if not self._not_full.wait_for(has_space, timeout if block else 0):
+                    raise Full
+            if self.closed:
+                raise QueueClosed('put() used on closed queue')
+            Queue.enqueue(self, data)
+            self._not_empty.notify()
+
+    def get(self, block = True, timeout = None):
+        """
+        Removes and returns the item at the front of the queue, waiting for one if the queue is empty.
+        After close() the remaining items are still returned before QueueClosed is raised.
+
+        :param block: If False, fail immediately instead of waiting for an item.
+        :param timeout: Maximum number of seconds to wait, or None to wait indefinitely.
+        :return: The item at the front of the queue.
+        :raises queue.Empty: If no item arrived in time.
+        :raises QueueClosed: If the queue is closed and drained, or cancelled.
+        """
+        with self._not_empty:
+            has_item = lambda: self.n > 0 or self.closed
+            if not self._not_empty.wait_for(has_item, timeout if block else 0):
+                raise Empty
+            if self.n == 0:
+                raise QueueClosed('get() used on closed queue')
+            item = Queue.dequeue(self)
+            self._not_full.notify()
+            return item
+
+    def enqueue(self, data):
+        """
+        Adds an item to the back of the queue, blocking while the queue is at its maximum size.
+
+        :param data: The item to be added to the queue.
+        """
+        self.put(data)
+
+    def dequeue(self):
+        """
+        Removes and returns the item from the front of the queue without waiting.
+
+        :return: The item at the front of the queue.
+        :raises IndexError: If the queue is empty.
+        """
+        with self._lock:
+            item = Queue.dequeue(self)
+            self._not_full.notify()
+            return item
+
+    def get_front(self):
+        """
+        Returns the item at the front of the queue without removing it.
+
+        :return: The front item of the queue, or None if the queue is empty.
+        """
+        with self._lock:
+            return Queue.get_front(self)
+
+    def close(self):
+        """
+        Stops the queue from accepting new items. Consumers can still get() the items already queued;
+        blocked producers and consumers waiting on an empty queue are woken with QueueClosed.
+        """
+        with self._lock:
+            self.closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    def cancel(self):
+        """
+        Closes the queue and discards every queued item, so all current and future put()/get() calls
+        raise QueueClosed.
+        """
+        with self._lock:
+            self.closed = True
+            self.cancelled = True
+            self.items = [None] * self.cap
+            self.n = 0
+            self.front = 0
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
 # Deque Class Implementation
 class Deque:
     """
@@ -182,12 +397,17 @@ class Deque:
     Prohibited operations: append(), pop(), insert().
     """
 
-    def __init__(self, cap = 10): # Add a default capacity
+    _empty = None  # Value written into slots that no longer hold an item
+
+    def __init__(self, cap = 10, shrink = False): # Add a default capacity
         """
         Initializes a new deque with a specified capacity.
         
         :param cap: Integer representing the deque's capacity.
+        :param shrink: If True, halve the capacity whenever the deque drops to a quarter full (never below cap).
         """
+        self.shrink = shrink  # Shrink-when-quarter-full policy
+        self.min_cap = cap  # Capacity the deque never shrinks below
         self.items = [None] * cap  # Underlying storage for deque items
         self.n = 0  # Number of items currently in the deque
         self.front = 0  # Index of the front item
@@ -235,8 +455,10 @@ class Deque:
         if self.n == 0:
             raise IndexError('pop_front() used on empty deque')
         item = self.items[self.front]
+        self.items[self.front] = self._empty  # Release the reference so the item can be freed
         self.front = (self.front + 1) % self.cap  # Move front pointer forward
         self.n -= 1
+        _shrink_if_sparse(self)
         return item
 
     def pop_back(self):
@@ -250,7 +472,9 @@ class Deque:
             raise IndexError('pop_back() used on empty deque')
         back = (self.front + self.n - 1) % self.cap  # Calculate the index for the last item
         item = self.items[back]
+        self.items[back] = self._empty  # Release the reference so the item can be freed
         self.n -= 1
+        _shrink_if_sparse(self)
         return item
 
     def get_front(self):
@@ -288,16 +512,98 @@ class Deque:
     def __getitem__(self, k):
         """
         Returns the k'th item from the front of the deque, without removing it.
+        A slice with a step of 1 returns a read-only DequeView over that range instead of a copy.
         
-        :param k: The index of the item to retrieve, where 0 is the front.
-        :return: The k'th item from the front of the deque.
+        :param k: The index of the item to retrieve, where 0 is the front, or a slice.
+        :return: The k'th item from the front of the deque, or a DequeView for a slice.
         :raises IndexError: If the index is out of range.
         """
+        if isinstance(k, slice):
+            start, stop, step = k.indices(self.n)
+            if step != 1:
+                raise ValueError('Deque slices must have a step of 1')
+            return self.window(start, stop)
         if k < 0 or k >= self.n:
             raise IndexError('Index out of range')
         index = (self.front + k) % self.cap
         return self.items[index]
 
+    def __iter__(self):
+        """
+        Iterates over the items from front to back without copying them. The ring buffer is walked as (at most)
+        two contiguous runs, so no modulo is needed per item.
+
+        :return: An iterator over the items of the deque.
+        """
+        items = self.items
+        end = self.front + self.n
+        for i in range(self.front, min(end, self.cap)):
+            yield items[i]
+        for i in range(end - self.cap):
+            yield items[i]
+
+    def __reversed__(self):
+        """
+        Iterates over the items from back to front without copying them.
+
+        :return: An iterator over the items of the deque in reverse order.
+        """
+        items = self.items
+        end = self.front + self.n
+        for i in range(end - self.cap - 1, -1, -1):
+            yield items[i]
+        for i in range(min(end, self.cap) - 1, self.front - 1, -1):
+            yield items[i]
+
+    def rotate(self, k = 1):
+        """
+        Rotates the deque k steps to the right (the back item moves to the front); a negative k rotates left.
+        Items are moved the shorter way round, so this is O(min(k, n - k)), and O(1) when the deque is full.
+
+        :param k: The number of steps to rotate.
+        """
+        if self.n <= 1:
+            return
+        k %= self.n
+        if k > self.n // 2:
+            k -= self.n  # Rotating left is shorter
+        if self.n == self.cap:
+            # Every slot is in use, so moving the front index is the whole rotation
+            self.front = (self.front - k) % self.cap
+            return
+        for _ in range(k):
+            back = (self.front + self.n - 1) % self.cap
+            self.front = (self.front - 1) % self.cap
+            self.items[self.front] = self.items[back]
+            self.items[back] = self._empty
+        for _ in range(-k):
+            self.items[(self.front + self.n) % self.cap] = self.items[self.front]
+            self.items[self.front] = self._empty
+            self.front = (self.front + 1) % self.cap
+
+    def window(self, start, stop):
+        """
+        Returns a lightweight read-only view of the items at positions start..stop-1 (0 is the front).
+        The view reads through to the deque, so it always reflects the deque's current contents.
+
+        :param start: Position of the first item in the window.
+        :param stop: Position one past the last item in the window.
+        :return: A DequeView over the range.
+        :raises IndexError: If the range does not lie within the deque.
+        """
+        if start < 0 or stop > self.n or start > stop:
+            raise IndexError('Window out of range')
+        return DequeView(self, start, stop)
+
+    def memory_usage(self, deep = False):
+        """
+        Returns the number of bytes used by the deque and its storage.
+        
+        :param deep: If True, also count the items currently in the deque.
+        :return: Integer size in bytes.
+        """
+        return _memory_usage(self, iter(self), deep)
+
     def resize(self, new_cap):
         """
         Resizes the deque's capacity.
@@ -310,3 +616,456 @@ class Deque:
         self.items = new_storage
         self.front = 0
         self.cap = new_cap
+
+
+# Deque View Class Implementation
+class DequeView:
+    """
+    A read-only window over a range of positions in a Deque. It stores only the deque and the range, so creating
+    one is O(1) and no items are copied.
+    """
+
+    def __init__(self, deque, start, stop):
+        """
+        Initializes a view over positions start..stop-1 of a deque.
+
+        :param deque: The Deque being viewed.
+        :param start: Position of the first item in the window.
+        :param stop: Position one past the last item in the window.
+        """
+        self.deque = deque
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        """
+        Returns the number of positions covered by the view.
+
+        :return: The number of items as an integer.
+        """
+        return self.stop - self.start
+
+    def __getitem__(self, k):
+        """
+        Returns the k'th item of the window.
+
+        :param k: The index within the window, where 0 is the window's first item.
+        :return: The k'th item of the window.
+        :raises IndexError: If the index is out of range.
+        """
+        if k < 0 or k >= self.stop - self.start:
+            raise IndexError('Index out of range')
+        return self.deque[self.start + k]
+
+    def __iter__(self):
+        """
+        Iterates over the items of the window without copying them.
+
+        :return: An iterator over the items in the window.
+        """
+        deque = self.deque
+        items = deque.items
+        stop = min(self.stop, deque.n)  # The deque may have shrunk since the view was made
+        begin = deque.front + self.start
+        end = deque.front + stop
+        for i in range(min(begin, deque.cap), min(end, deque.cap)):
+            yield items[i]
+        for i in range(max(begin - deque.cap, 0), end - deque.cap):
+            yield items[i]
+
+
+def _round_up_pow2(cap):
+    """
+    Rounds a capacity up to the next power of two (minimum 1).
+
+    :param cap: Integer capacity.
+    :return: The smallest power of two that is >= cap.
+    """
+    return 1 << max(cap - 1, 0).bit_length()
+
+
+# Power-of-two Queue Class Implementation
+class MaskedQueue(Queue):
+    """
+    A queue whose capacity is always a power of two, so ring positions are computed with a bitmask
+    instead of % on every operation. capacity() reports the rounded capacity actually allocated.
+    """
+
+    def __init__(self, cap = 16, shrink = False): # Add a default capacity
+        """
+        Initializes a new queue with the specified capacity rounded up to a power of two.
+        
+        :param cap: Integer representing the minimum capacity of the queue.
+        :param shrink: If True, halve the capacity whenever the queue drops to a quarter full (never below cap).
+        """
+        super().__init__(_round_up_pow2(cap), shrink)
+        self.mask = self.cap - 1  # cap - 1 has every bit below cap set
+
+    def enqueue(self, data):
+        """
+        Adds an item to the back of the queue. May trigger a resize operation if the queue is full.
+        
+        :param data: The item to be added to the queue.
+        """
+        if self.n == self.cap:
+            self.resize(2 * self.cap)
+        self.items[(self.front + self.n) & self.mask] = data
+        self.n += 1
+
+    def dequeue(self):
+        """
+        Removes and returns the item from the front of the queue.
+        
+        :return: The item at the front of the queue.
+        :raises IndexError: If the queue is empty.
+        """
+        if self.n == 0:
+            raise IndexError('dequeue() used on empty queue')
+        item = self.items[self.front]
+        self.items[self.front] = self._empty  # Release the reference so the item can be freed
+        self.front = (self.front + 1) & self.mask
+        self.n -= 1
+        _shrink_if_sparse(self)
+        return item
+
+    def resize(self, new_cap):
+        """
+        Resizes the queue's capacity, rounding it up to a power of two.
+        
+        :param new_cap: The new minimum capacity as an integer.
+        """
+        super().resize(_round_up_pow2(new_cap))
+        self.mask = self.cap - 1
+
+
+# Power-of-two Deque Class Implementation
+class MaskedDeque(Deque):
+    """
+    A deque whose capacity is always a power of two, so ring positions are computed with a bitmask
+    instead of % on every operation. capacity() reports the rounded capacity actually allocated.
+    """
+
+    def __init__(self, cap = 16, shrink = False): # Add a default capacity
+        """
+        Initializes a new deque with the specified capacity rounded up to a power of two.
+        
+        :param cap: Integer representing the minimum capacity of the deque.
+        :param shrink: If True, halve the capacity whenever the deque drops to a quarter full (never below cap).
+        """
+        super().__init__(_round_up_pow2(cap), shrink)
+        self.mask = self.cap - 1  # cap - 1 has every bit below cap set
+
+    def push_front(self, data):
+        """
+        Adds an item to the front of the deque. May trigger a resize operation if the deque is full.
+        
+        :param data: The item to be added to the front of the deque.
+        """
+        if self.n == self.cap:
+            self.resize(2 * self.cap)
+        self.front = (self.front - 1) & self.mask  # Masking wraps -1 round to cap - 1
+        self.items[self.front] = data
+        self.n += 1
+
+    def push_back(self, data):
+        """
+        Adds an item to the back of the deque. May trigger a resize operation if the deque is full.
+        
+        :param data: The item to be added to the back of the deque.
+        """
+        if self.n == self.cap:
+            self.resize(2 * self.cap)
+        self.items[(self.front + self.n) & self.mask] = data
+        self.n += 1
+
+    def pop_front(self):
+        """
+        Removes and returns the item from the front of the deque.
+        
+        :return: The item at the front of the deque.
+        :raises IndexError: If the deque is empty.
+        """
+        if self.n == 0:
+            raise IndexError('pop_front() used on empty deque')
+        item = self.items[self.front]
+        self.items[self.front] = self._empty  # Release the reference so the item can be freed
+        self.front = (self.front + 1) & self.mask
+        self.n -= 1
+        _shrink_if_sparse(self)
+        return item
+
+    def pop_back(self):
+        """
+        Removes and returns the item from the back of the deque.
+        
+        :return: The item at the back of the deque.
+        :raises IndexError: If the deque is empty.
+        """
+        if self.n == 0:
+            raise IndexError('pop_back() used on empty deque')
+        self.n -= 1
+        back = (self.front + self.n) & self.mask
+        item = self.items[back]
+        self.items[back] = self._empty  # Release the reference so the item can be freed
+        _shrink_if_sparse(self)
+        return item
+
+    def get_back(self):
+        """
+        Returns the item at the back of the deque without removing it.
+        
+        :return: The back item of the deque, or None if the deque is empty.
+        """
+        return None if self.n == 0 else self.items[(self.front + self.n - 1) & self.mask]
+
+    def __getitem__(self, k):
+        """
+        Returns the k'th item from the front of the deque, without removing it.
+        A slice with a step of 1 returns a read-only DequeView over that range instead of a copy.
+        
+        :param k: The index of the item to retrieve, where 0 is the front, or a slice.
+        :return: The k'th item from the front of the deque, or a DequeView for a slice.
+        :raises IndexError: If the index is out of range.
+        """
+        if isinstance(k, slice):
+            return super().__getitem__(k)
+        if k < 0 or k >= self.n:
+            raise IndexError('Index out of range')
+        return self.items[(self.front + k) & self.mask]
+
+    def resize(self, new_cap):
+        """
+        Resizes the deque's capacity, rounding it up to a power of two.
+        
+        :param new_cap: The new minimum capacity as an integer.
+        """
+        super().resize(_round_up_pow2(new_cap))
+        self.mask = self.cap - 1
+
+# Typed Storage Helpers
+class _PairArray:
+    """
+    Storage for (row, col) pairs kept as two parallel typed arrays. Indexing returns a (row, col) tuple and
+    assigning a pair writes each half into its own array, so it can stand in for the list used by the containers.
+    """
+
+    def __init__(self, typecode, cap):
+        """
+        Initializes two zero-filled arrays of the given typecode and length.
+
+        :param typecode: array typecode used for both halves of the pair.
+        :param cap: Integer number of slots.
+        """
+        self.rows = array(typecode, [0]) * cap  # Row half of every stored pair
+        self.cols = array(typecode, [0]) * cap  # Column half of every stored pair
+
+    def __getitem__(self, k):
+        return (self.rows[k], self.cols[k])
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + sys.getsizeof(self.rows) + sys.getsizeof(self.cols)
+
+    def __setitem__(self, k, pair):
+        self.rows[k], self.cols[k] = pair
+
+
+class _TypedRing:
+    """
+    Shared storage handling for the array-backed queue and deque variants. The ring-buffer logic itself is
+    inherited unchanged from Queue/Deque; only the allocation, resizing and buffer export live here.
+    """
+
+    _empty = 0  # Typed slots cannot hold None
+
+    def _init_storage(self, cap, typecode, shrink):
+        """
+        Sets up an empty ring buffer backed by typed storage.
+
+        :param cap: Integer representing the initial capacity.
+        :param typecode: array typecode of the stored values.
+        :param shrink: If True, halve the capacity whenever the container drops to a quarter full.
+        """
+        self.shrink = shrink
+        self.min_cap = cap
+        self.typecode = typecode
+        self.items = self._new_storage(cap)  # Underlying typed storage
+        self.n = 0  # Number of items currently stored
+        self.front = 0  # Index of the front item
+        self.cap = cap  # Total capacity
+
+    def _new_storage(self, cap):
+        """
+        Allocates zero-filled storage for cap items.
+
+        :param cap: Integer number of slots.
+        :return: A new typed array.
+        """
+        return array(self.typecode, [0]) * cap
+
+    def resize(self, new_cap):
+        """
+        Resizes the capacity, realigning the stored items so the front is at index 0.
+
+        :param new_cap: The new capacity as an integer.
+        """
+        new_storage = self._new_storage(new_cap)
+        for i in range(self.n):
+            new_storage[i] = self.items[(self.front + i) % self.cap]  # Realign items starting at index 0
+        self.items = new_storage
+        self.front = 0
+        self.cap = new_cap
+
+    def memory_usage(self, deep = False):
+        """
+        Returns the number of bytes used by the container and its storage. Items are stored unboxed in the
+        storage, so deep makes no difference.
+
+        :param deep: Accepted for compatibility with the list-backed containers.
+        :return: Integer size in bytes.
+        """
+        return _memory_usage(self, (), False)
+
+    def compact(self):
+        """
+        Realigns the stored items so they start at index 0 without changing the capacity. Afterwards
+        segments() always returns a single view.
+        """
+        if self.front != 0:
+            self.resize(self.cap)
+
+    def buffer(self):
+        """
+        Returns a zero-copy view of the whole underlying storage, including unused slots.
+
+        :return: A memoryview over the typed array.
+        """
+        return memoryview(self.items)
+
+    def segments(self):
+        """
+        Returns zero-copy views covering the stored items in front-to-back order. Because the storage is a ring,
+        the items are split in two when they wrap past the end of the array.
+
+        :return: A tuple of one or two memoryviews (empty tuple if there are no items).
+        """
+        return _ring_segments(self.buffer(), self.front, self.n, self.cap)
+
+
+def _ring_segments(view, front, n, cap):
+    """
+    Slices a memoryview of ring storage into the (at most two) runs that hold the live items.
+
+    :param view: memoryview over the full storage.
+    :param front: Index of the front item.
+    :param n: Number of live items.
+    :param cap: Capacity of the storage.
+    :return: A tuple of memoryviews in front-to-back order.
+    """
+    if n == 0:
+        return ()
+    end = front + n
+    if end <= cap:
+        return (view[front:end],)
+    return (view[front:], view[:end - cap])
+
+
+# Typed Queue Class Implementation
+class TypedQueue(_TypedRing, Queue):
+    """
+    A queue backed by a typed array instead of a Python list, so each item costs a few bytes instead of a pointer
+    plus a boxed object. Items must fit the typecode (default 'i', a signed C int).
+    """
+
+    def __init__(self, cap = 10, typecode = 'i', shrink = False):
+        """
+        Initializes a new typed queue with a specified capacity.
+
+        :param cap: Integer representing the queue's capacity.
+        :param typecode: array typecode of the stored values.
+        :param shrink: If True, halve the capacity whenever it drops to a quarter full (never below cap).
+        """
+        self._init_storage(cap, typecode, shrink)
+
+
+# Typed Deque Class Implementation
+class TypedDeque(_TypedRing, Deque):
+    """
+    A deque backed by a typed array instead of a Python list, so each item costs a few bytes instead of a pointer
+    plus a boxed object. Items must fit the typecode (default 'i', a signed C int).
+    """
+
+    def __init__(self, cap = 10, typecode = 'i', shrink = False):
+        """
+        Initializes a new typed deque with a specified capacity.
+
+        :param cap: Integer representing the deque's capacity.
+        :param typecode: array typecode of the stored values.
+        :param shrink: If True, halve the capacity whenever it drops to a quarter full (never below cap).
+        """
+        self._init_storage(cap, typecode, shrink)
+
+
+class _CoordRing(_TypedRing):
+    """
+    Storage handling for the coordinate variants, which keep rows and columns in two parallel typed arrays.
+    """
+
+    _empty = (0, 0)
+
+    def _new_storage(self, cap):
+        return _PairArray(self.typecode, cap)
+
+    def buffer(self):
+        """
+        Returns zero-copy views of the whole row and column storage, including unused slots.
+
+        :return: A (rows, cols) tuple of memoryviews.
+        """
+        return (memoryview(self.items.rows), memoryview(self.items.cols))
+
+    def segments(self):
+        """
+        Returns zero-copy views covering the stored coordinates in front-to-back order, split in two when they
+        wrap past the end of the storage.
+
+        :return: A tuple of one or two (rows, cols) memoryview pairs (empty tuple if there are no items).
+        """
+        rows, cols = self.buffer()
+        return tuple(zip(_ring_segments(rows, self.front, self.n, self.cap),
+                         _ring_segments(cols, self.front, self.n, self.cap)))
+
+
+# Coordinate Queue Class Implementation
+class CoordQueue(_CoordRing, Queue):
+    """
+    A queue of (row, col) pairs stored in two parallel typed arrays (default 'h', a signed short, so each pair
+    takes 4 bytes). dequeue() and get_front() return (row, col) tuples.
+    """
+
+    def __init__(self, cap = 10, typecode = 'h', shrink = False):
+        """
+        Initializes a new coordinate queue with a specified capacity.
+
+        :param cap: Integer representing the queue's capacity.
+        :param typecode: array typecode used for the row and column arrays.
+        :param shrink: If True, halve the capacity whenever it drops to a quarter full (never below cap).
+        """
+        self._init_storage(cap, typecode, shrink)
+
+
+# Coordinate Deque Class Implementation
+class CoordDeque(_CoordRing, Deque):
+    """
+    A deque of (row, col) pairs stored in two parallel typed arrays (default 'h', a signed short, so each pair
+    takes 4 bytes). The pop/get methods and indexing return (row, col) tuples.
+    """
+
+    def __init__(self, cap = 10, typecode = 'h', shrink = False):
+        """
+        Initializes a new coordinate deque with a specified capacity.
+
+        :param cap: Integer representing the deque's capacity.
+        :param typecode: array typecode used for the row and column arrays.
+        :param shrink: If True, halve the capacity whenever it drops to a quarter full (never below cap).
+        """
+        self._init_storage(cap, typecode, shrink)
@@ -2,6 +2,7 @@
 #    Main Reviewer(s):
 
 import copy
+import sys
 
 from a1_partc import Queue
 
@@ -131,3 +132,126 @@ def overflow(grid, a_queue):
 	a_queue.enqueue(copy.deepcopy(grid))
 
 	return overflow(grid, a_queue) + 1
+
+
+
+"""
+_board_layout(rows, cols)
+
+arguments:
+rows - number of rows in the grid
+cols - number of columns in the grid
+
+functionality:
+Works out, once per grid size, how many neighbours each cell has (the value at which it overflows)
+and the neighbour coordinates in the same order overflow visits them (up, down, left, right).
+The result is cached so repeated calls for the same grid size are free.
+
+return:
+Tuple (limits, neighbours) of 2D lists indexed by [row][col].
+"""
+_layouts = {}
+
+def _board_layout(rows, cols):
+	layout = _layouts.get((rows, cols))
+	if layout is None:
+		limits = [[0] * cols for _ in range(rows)]
+		neighbours = [[None] * cols for _ in range(rows)]
+		for i in range(rows):
+			for j in range(cols):
+				cells = [(x, y) for x, y in [(i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)]
+						 if 0 <= x < rows and 0 <= y < cols]
+				limits[i][j] = len(cells)
+				neighbours[i][j] = cells
+		layout = (limits, neighbours)
+		_layouts[(rows, cols)] = layout
+	return layout
+
+
+"""
+arguments:
+grid - 2D array (python lists) of numbers, changed in place
+row, col - the cell the gem is added to
+player - 1 or -1, the value added to the cell
+changes - optional list; every cell change is appended to it as (row, col, old_value, new_value)
+
+This function places a gem and then settles the board exactly like calling overflow on it,
+but without a queue or any board copies: every wave is applied directly to grid.
+Because changes records each cell change in order, callers can keep hashes or
+running totals up to date, or undo the whole move by replaying the list backwards.
+
+The function returns the number of overflow waves (the number of grids overflow would have enqueued).
+Some tiny grids never settle; like overflow, this raises RecursionError once the number of waves
+reaches the interpreter's recursion limit.
+"""
+def apply_move(grid, row, col, player, changes = None):
+	rows = len(grid)
+	cols = len(grid[0])
+	limits, neighbours = _board_layout(rows, cols)
+
+	old = grid[row][col]
+	grid[row][col] = old + player
+	if changes is not None:
+		changes.append((row, col, old, old + player))
+
+	waves = 0
+	while True:
+		# find the overflowing cells and whether both signs are still on the board
+		overflowing = []
+		has_pos = False
+		has_neg = False
+		for i in range(rows):
+			grid_row = grid[i]
+			limit_row = limits[i]
+			for j in range(cols):
+				value = grid_row[j]
+				if value > 0:
+					has_pos = True
+					if value >= limit_row[j]:
+						overflowing.append((i, j, value))
+				elif value < 0:
+					has_neg = True
+					if -value >= limit_row[j]:
+						overflowing.append((i, j, value))
+				elif limit_row[j] == 0:
+					# a 1x1 grid overflows even when empty, as in get_overflow_list
+					overflowing.append((i, j, value))
+
+		# same base case as overflow
+		if not overflowing or not has_pos or not has_neg:
+			return waves
+
+		for i, j, value in overflowing:
+			if changes is not None and value != 0:
+				changes.append((i, j, value, 0))
+			grid[i][j] = 0
+
+		for i, j, value in overflowing:
+			for x, y in neighbours[i][j]:
+				old = grid[x][y]
+				new = abs(old) + 1
+				# the adjacent cell takes the sign of the overflowing cell
+				if value < 0:
+					new = -new
+				grid[x][y] = new
+				if changes is not None:
+					changes.append((x, y, old, new))
+
+		waves += 1
+		if waves >= sys.getrecursionlimit():
+			raise RecursionError('overflow did not settle')
+
+
+
+"""
+arguments:
+grid - 2D array (python lists) of numbers, changed in place
+changes - list of (row, col, old_value, new_value) recorded by apply_move for the last move on grid
+
+This function undoes a move made with apply_move by restoring every recorded
+cell change, newest first, leaving grid exactly as it was before the move.
+"""
+def revert_move(grid, changes):
+	for i in range(len(changes) - 1, -1, -1):
+		row, col, old, new = changes[i]
+		grid[row][col] = old
@@ -308,3 +308,97 @@ class HashTable:
     """
     def __len__(self):       
         return self.size
+
+
+
+"""
+TranspositionTable class:
+a HashTable of search results keyed by position hash, with hit-rate statistics
+"""
+class TranspositionTable(HashTable):
+    # Kinds of score an entry can hold
+    EXACT = 0
+    # The real score is at least the stored one (the search was cut off above beta)
+    LOWER = 1
+    # The real score is at most the stored one (no move beat alpha)
+    UPPER = 2
+
+    """
+    __init__(cap=1024)
+
+    arguments:
+    cap - The initial capacity of the table (default: 1024).
+
+    functionality:
+    Initializes an empty transposition table and zeroes its statistics.
+
+    return:
+    None.
+    """
+    def __init__(self, cap=1024):
+        super().__init__(cap)
+        # Number of lookups
+        self.probes = 0
+        # Number of lookups that found an entry
+        self.hits = 0
+        # Number of entries written (new or replaced)
+        self.stores = 0
+
+
+    """
+    store(key, depth, score, flag, move)
+
+    arguments:
+    key - Integer hash of the position (including whose turn it is).
+    depth - Number of plies searched below the position.
+    score - Score found by the search.
+    flag - EXACT, LOWER or UPPER, saying how score relates to the real score.
+    move - Best move found from the position (None if unknown).
+
+    functionality:
+    Records a search result, replacing any earlier entry for the same key.
+
+    return:
+    None.
+    """
+    def store(self, key, depth, score, flag, move):
+        entry = (depth, score, flag, move)
+        if not self.modify(key, entry):
+            self.insert(key, entry)
+        self.stores += 1
+
+
+    """
+    probe(key)
+
+    arguments:
+    key - Integer hash of the position (including whose turn it is).
+
+    functionality:
+    Looks up the entry for a position and updates the hit statistics.
+
+    return:
+    Tuple (depth, score, flag, move) if the position is stored, None otherwise.
+    """
+    def probe(self, key):
+        self.probes += 1
+        entry = self.search(key)
+        if entry is not None:
+            self.hits += 1
+        return entry
+
+
+    """
+    hit_rate()
+
+    arguments:
+    None.
+
+    functionality:
+    Calculates the fraction of lookups that found an entry.
+
+    return:
+    Float between 0 and 1 (0.0 if there have been no lookups).
+    """
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
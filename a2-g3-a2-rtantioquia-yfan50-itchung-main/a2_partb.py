@@ -1,8 +1,20 @@
 # Main Author: Raphael Antioquia, In Tae Chung
 # Main Reviewer: In Tae Chung
 
-from a1_partd import overflow
-from a1_partc import Queue
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    # Without NumPy, evaluate_boards scores the boards one at a time with evaluate_board
+    np = None
+
+from a1_partd import _board_layout, apply_move, revert_move
+from a2_parta import TranspositionTable
 
 """
 copy_board(board)
@@ -38,273 +50,2321 @@ The function calculates the score for each player based on the board state,
 assigning higher scores to winning conditions and lower scores to losing conditions.
 The scoring mechanism is determined by the number of pieces each player has on the board,
 with adjustments made for winning or losing conditions.
+The pieces are counted by EvalState, which the in-place search also keeps up to date move by move.
 
 return:
 Integer representing the score of the board from the specified player's perspective.
 """
 def evaluate_board(board, player):
-    player_score = 0
-    opponent_score = 0
+    return EvalState(board).score(player)
 
-    # Looping through each cell in the game board
-    for i in range(len(board)):
-        for j in range(len(board[0])):
-            # Get the value of the current cell
-            cell_value = board[i][j]  
-            
-            # If the cell's value is positive, it represents player 1's pieces
-            if cell_value > 0:
-                if player == 1:
-                    # If evaluating for player 1, add to player's score
-                    player_score += cell_value  
-                else:
-                    # If evaluating for player 2, add to opponent's score (player 1's pieces)
-                    opponent_score += cell_value  
-            
-            # If the cell's value is negative, it represents player 2's pieces
-            elif cell_value < 0:
-                if player == -1:
-                    # If evaluating for player 2, add positive value to player's score
-                    player_score += abs(cell_value)  
-                else:
-                    # If evaluating for player 1, add positive value to opponent's score (player 2's pieces)
-                    opponent_score += abs(cell_value)  
 
+"""
+evaluate_boards(boards, player)
+
+arguments:
+boards - List of 2D lists, all the same size.
+player - Integer identifying the player (1 or -1) every board is scored for.
+
+functionality:
+Scores many boards at once. With NumPy the boards are stacked into one array and both sides' gems are
+summed for all of them in a single vectorized pass; the win, loss and clamp rules are then applied
+to the whole batch. Without NumPy each board goes through evaluate_board.
 
-    # Determine the winning condition and assign a fixed score for it
-    if player_score > opponent_score and opponent_score == 0:
-        # Fixed score for a clear winning condition
-        return 100 
-    elif player_score == 0 and opponent_score > 0:
-        # Fixed score for a clear losing condition
-        return -100  
+return:
+List of integer scores, the same as [evaluate_board(board, player) for board in boards].
+"""
+def evaluate_boards(boards, player):
+    if np is None or not boards:
+        return [evaluate_board(board, player) for board in boards]
+    stacked = np.array(boards, dtype=np.int64)
+    p1_total = np.where(stacked > 0, stacked, 0).sum(axis=(1, 2))
+    p2_total = -np.where(stacked < 0, stacked, 0).sum(axis=(1, 2))
+    if player == 1:
+        player_score, opponent_score = p1_total, p2_total
     else:
-        # Calculate a nuanced score based on the net advantage for other conditions
-        net_score = player_score - opponent_score
-        # Ensures a non-negative score that reflects the player's advantage
-        return max(0, net_score)  
+        player_score, opponent_score = p2_total, p1_total
+    scores = np.maximum(0, player_score - opponent_score)
+    scores = np.where((player_score == 0) & (opponent_score > 0), -100, scores)
+    scores = np.where((player_score > opponent_score) & (opponent_score == 0), 100, scores)
+    return scores.tolist()
+
+
+"""
+EvalState class:
+running totals of each side's gems, kept up to date from the cells a move changes
+so a board can be scored, or checked for a win, without rescanning it
+"""
+class EvalState:
+    """
+    EvalState.__init__(board)
 
+    arguments:
+    board - 2D list of integers representing the game board.
 
+    functionality:
+    Counts the gems (sum of absolute values) and occupied cells of each side.
+
+    return:
+    None.
+    """
+    def __init__(self, board):
+        # Gems and occupied cells for player 1 (positive values) and player 2 (negative values),
+        # counted in locals since evaluate_board builds one of these for every leaf
+        p1_total = p2_total = p1_cells = p2_cells = 0
+        for row in board:
+            for value in row:
+                if value > 0:
+                    p1_total += value
+                    p1_cells += 1
+                elif value < 0:
+                    p2_total -= value
+                    p2_cells += 1
+        self.p1_total = p1_total
+        self.p2_total = p2_total
+        self.p1_cells = p1_cells
+        self.p2_cells = p2_cells
 
-class GameTree:
     """
-    GameTree.Node.__init__(board, depth, player, tree_height, score, move)
+    add(value) / remove(value)
 
     arguments:
-    board - 2D list representing the state of the game board.
-    depth - Current depth in the game tree.
-    player - Current player (1 or -1).
-    tree_height - Maximum height of the game tree.
-    score - Evaluation score of the node (None if not evaluated).
-    move - The move that led to this board state (None if root).
+    value - Value of a cell entering or leaving the board.
 
     functionality:
-    Initializes a Node in the GameTree. Sets up the game board associated with this node,
-    the depth in the tree, the player's turn, and optionally the score and move that led to this state.
-    The node initializes an empty list for children nodes to be added during tree expansion.
+    Adds a cell's gems to, or takes them out of, the owning side's totals.
 
     return:
     None.
     """
-    class Node:
-        def __init__(self, board, depth, player, tree_height = 4, score = None, move = None):
-            self.board = copy_board(board)
-            self.depth = depth
-            self.player = player
-            self.height = tree_height
-            # Array that holds child nodes
-            self.children = [] 
-            self.score = score
-            self.move = move
+    def add(self, value):
+        if value > 0:
+            self.p1_total += value
+            self.p1_cells += 1
+        elif value < 0:
+            self.p2_total -= value
+            self.p2_cells += 1
 
+    def remove(self, value):
+        if value > 0:
+            self.p1_total -= value
+            self.p1_cells -= 1
+        elif value < 0:
+            self.p2_total += value
+            self.p2_cells -= 1
 
     """
-    GameTree.__init__(board, player, tree_height)
+    update(changes) / revert(changes)
 
     arguments:
-    board - 2D list representing the state of the game board at the root of the game tree.
-    player - The player (1 or -1) the tree is being created for.
-    tree_height - Maximum height of the game tree.
+    changes - List of (row, col, old_value, new_value) recorded by a1_partd.apply_move.
 
     functionality:
-    Initializes the GameTree object with the root node set to the given board state.
-    Calls create_tree to recursively build the game tree to the specified height
-    and applies the minimax algorithm to evaluate and score the nodes.
+    update brings the totals forward over the cells a move changed; revert takes them back,
+    to be called alongside a1_partd.revert_move.
 
     return:
     None.
     """
-    def __init__(self, board, player, tree_height = 4):
-        self.player = player
-        self.board = copy_board(board)
-        # Define the root
-        self.root = self.Node(self.board, 0, player, tree_height) 
-        # Create tree with self.root as starting point
-        self.create_tree(self.root) 
-        # Minimax algorithm to determine score of nodes
-        self.minimax(self.root, player) 
-    
+    def update(self, changes):
+        for _, _, old, new in changes:
+            self.remove(old)
+            self.add(new)
+
+    def revert(self, changes):
+        for _, _, old, new in changes:
+            self.remove(new)
+            self.add(old)
+
     """
-    create_tree(subtree)
+    score(player)
 
-    argument: 
-    subtree - A Node object representing the current node in the game tree from which the tree will expand.
+    arguments:
+    player - Integer identifying the player (1 or -1).
 
     functionality:
-    Recursively expands the game tree from the given subtree by iterating over possible moves from the current board state.
-    For each valid move, a new child Node is created with the resulting board state, and create_tree is called recursively
-    until the maximum depth (tree_height) is reached or no more valid moves are available. This process builds out
-    the complete game tree from the perspective of the initial player.
+    Scores the counted board from the player's perspective in O(1), with the same rules evaluate_board
+    has always used.
 
-    return: 
-    None. The game tree is built in-place by modifying the children of the Nodes.
+    return:
+    100 for a win, -100 for a loss, otherwise the player's gem lead clamped at 0.
     """
-    def create_tree(self, subtree):
-        # Base case: If depth hits the limit of tree_height, end function
-        if subtree.depth == subtree.height - 1: 
-            return
+    def score(self, player):
+        if player == 1:
+            player_score, opponent_score = self.p1_total, self.p2_total
+        else:
+            player_score, opponent_score = self.p2_total, self.p1_total
+
+        # Determine the winning condition and assign a fixed score for it
+        if player_score > opponent_score and opponent_score == 0:
+            # Fixed score for a clear winning condition
+            return 100
+        elif player_score == 0 and opponent_score > 0:
+            # Fixed score for a clear losing condition
+            return -100
+        else:
+            # Calculate a nuanced score based on the net advantage for other conditions
+            net_score = player_score - opponent_score
+            # Ensures a non-negative score that reflects the player's advantage
+            return max(0, net_score)
 
-        # Iterate through board to determine valid moves
-        for i in range(len(subtree.board)):
-            for j in range(len(subtree.board[0])):
-                cell_value = subtree.board[i][j]
-                valid_move = False
-                
-                # Check if a move is valid for the current player
-                if cell_value == 0:
-                    valid_move = True
-                elif cell_value > 0 and subtree.player == 1:
-                    valid_move = True
-                elif cell_value < 0 and subtree.player == -1:
-                    valid_move = True
-                
-                # Common logic for handling a valid move
-                if valid_move:
-                    new_board = copy_board(subtree.board) # Create new board, so you don't affect the root board
-                    new_board[i][j] += subtree.player # Add player gem to valid location
-                    overflow(new_board, Queue()) # Overflow the new_board
-                    new_child = self.Node(new_board, subtree.depth + 1, -subtree.player, subtree.height, move=(i, j)) # Create child node based on new board, increased depth, swapped player, height, and move used
-                    subtree.children.append(new_child) # Push the child node to the current subtree's children array
-        
-        # After all possible children have been added to children array, iterating through each child recursively creating the subtree
-        for child in subtree.children:
-            self.create_tree(child) # Recursively continue creating children until base case is reached
-    
-    
     """
-    minimax(node, maximizing_player)
+    winner()
+
+    functionality:
+    Checks whether one side has no pieces left, the test game.Board.check_win makes once play has started.
+
+    return:
+    1 if player 2 has no pieces, -1 if player 1 has no pieces, 0 otherwise.
+    """
+    def winner(self):
+        if self.p1_cells == 0:
+            return -1
+        if self.p2_cells == 0:
+            return 1
+        return 0
+
+
+"""
+valid_moves(board, player)
+
+arguments:
+board - 2D list of integers representing the game board.
+player - Integer identifying the player (1 or -1).
+
+functionality:
+Lists the cells the player may place a gem on: empty cells and cells already holding the player's gems.
+
+return:
+List of (row, col) tuples in row-major order.
+"""
+def valid_moves(board, player):
+    moves = []
+    for i in range(len(board)):
+        for j in range(len(board[0])):
+            cell_value = board[i][j]
+            # Empty cells and the player's own cells are valid
+            if cell_value == 0 or (cell_value > 0 and player == 1) or (cell_value < 0 and player == -1):
+                moves.append((i, j))
+    return moves
+
+
+"""
+ZobristHasher class:
+hashes boards as the XOR of a random 64-bit key per (row, col, value), so a move
+can update the hash from the list of cells it changed instead of rescanning the board
+"""
+class ZobristHasher:
+    """
+    ZobristHasher.__init__(seed)
 
     arguments:
-    node - A Node object representing the current position in the game tree.
-    maximizing_player - Boolean indicating if the current node is evaluated from the perspective of the maximizing player.
+    seed - Integer the keys are derived from (default: 0x5EED).
 
     functionality:
-    Applies the minimax algorithm to evaluate the game tree rooted at the given node. For each node, it recursively
-    calculates the optimal score by exploring all possible moves and their outcomes. The function chooses the move
-    that maximizes the player's score if it's the player's turn, and minimizes the score if it's the opponent's turn.
-    The scores are propagated up the tree, allowing the algorithm to determine the best possible move at the root.
+    Creates a hasher. Keys are made on first use and cached; each key depends only on the seed
+    and the (row, col, value) it stands for, so hashes are the same in every run and process.
 
     return:
-    Integer representing the score of the node. For leaf nodes, the score is directly calculated from the board state.
-    For internal nodes, the score is derived from the minimax evaluation of its children.
-    """                
-    def minimax(self, node, maximizing_player):
-        # Check if the current node is a leaf node, either because it's reached the
-        # maximum depth or represents a terminal game state (win or lose).
-        if node.depth == node.height - 1 or node.score in [100, -100]:
-            node.score = evaluate_board(node.board, maximizing_player)
-            return node.score
-        
-        # If the current node represents the maximizing player's turn.
-        if node.player == maximizing_player:
-            # Initialize the best score for the maximizing player to negative infinity,
-            # ensuring any score will be higher, thus making it possible to find the maximum score.
-            max_eval = -float('inf')
-            for child in node.children:
-                # Recursively call minimax on the child nodes, keeping the perspective of
-                # the maximizing player.
-                eval = self.minimax(child, maximizing_player)
-                # Update max_eval if the current child's evaluation is greater,
-                # effectively choosing the best (maximum) score.
-                max_eval = max(max_eval, eval)
-            # Assign the best score found among children to the current node.
-            node.score = max_eval
-            return node.score
-        else:
-            # If it's the minimizing player's turn, initialize the best score
-            # to positive infinity to find the minimum score among children.
-            min_eval = float('inf')
-            for child in node.children:
-                # Recursively call minimax on the child nodes, switching the perspective
-                # to that of the minimizing player (opponent).
-                eval = self.minimax(child, -maximizing_player)
-                # Update min_eval if the current child's evaluation is lower,
-                # effectively choosing the worst (minimum) score from the perspective
-                # of the maximizing player.
-                min_eval = min(min_eval, eval)
-            # Assign the worst score found among children to the current node.
-            node.score = min_eval
-            return node.score
+    None.
+    """
+    def __init__(self, seed = 0x5EED):
+        self.seed = seed
+        self.keys = {}
+
+    """
+    key(row, col, value)
+
+    functionality:
+    Returns the key for a cell holding value. Empty cells have key 0, so they do not affect the hash.
 
+    return:
+    Integer in [0, 2**64).
+    """
+    def key(self, row, col, value):
+        if value == 0:
+            return 0
+        k = self.keys.get((row, col, value))
+        if k is None:
+            k = random.Random((self.seed << 32) ^ (row << 20) ^ (col << 10) ^ (value & 0x3FF)).getrandbits(64)
+            self.keys[(row, col, value)] = k
+        return k
 
     """
-    get_move()
+    hash_board(board)
+
+    functionality:
+    Hashes a whole board from scratch.
+
+    return:
+    Integer hash of the board.
+    """
+    def hash_board(self, board):
+        h = 0
+        for i in range(len(board)):
+            for j in range(len(board[0])):
+                h ^= self.key(i, j, board[i][j])
+        return h
+
+    """
+    update(h, changes)
 
     arguments:
-    None. Operates on the GameTree object it is called upon.
+    h - Hash of the board before the changes.
+    changes - List of (row, col, old_value, new_value) as recorded by a1_partd.apply_move.
 
     functionality:
-    Determines the best move to make from the current board state. It iterates over all direct children of the root node,
-    evaluating their scores to choose the move that leads to the best outcome based on the minimax algorithm.
-    This method assumes that the game tree has already been built and evaluated.
+    Updates a hash for the recorded cell changes, by XORing out each old value and XORing in the new one.
 
     return:
-    Tuple (row, col) indicating the best move's coordinates on the board. If no move can improve the position, or in case of error,
-    the return value may be None.
+    Integer hash of the board after the changes.
     """
-    def get_move(self):
-        # Empty variable to store best array
-        best_move = None 
+    def update(self, h, changes):
+        key = self.key
+        for i, j, old, new in changes:
+            h ^= key(i, j, old) ^ key(i, j, new)
+        return h
 
-        # Initializing to -inf, so best_score will always update on first comparison
-        best_score = -float('inf')  
+    """
+    hash_symmetric(board) / update_symmetric(hashes, changes, rows, cols)
 
-        # Iterate through the self.root children to find best score
-        for child in self.root.children: 
-            if child.score > best_score:
-                best_score = child.score
-                best_move = child.move  
-                
-        return best_move
+    functionality:
+    Like hash_board and update, but keep one hash per board symmetry (see SYMMETRIES): hashes[k] is
+    the hash of the board mirrored by SYMMETRIES[k]. Mirror images of a position share the same four
+    hashes in a different order, so min(hashes) is the same for all of them.
+
+    return:
+    Tuple of four integer hashes.
+    """
+    def hash_symmetric(self, board):
+        rows = len(board)
+        cols = len(board[0])
+        hashes = []
+        for symmetry in SYMMETRIES:
+            h = 0
+            for i in range(rows):
+                for j in range(cols):
+                    x, y = transform_move((i, j), symmetry, rows, cols)
+                    h ^= self.key(x, y, board[i][j])
+            hashes.append(h)
+        return tuple(hashes)
+
+    def update_symmetric(self, hashes, changes, rows, cols):
+        key = self.key
+        hashes = list(hashes)
+        for i, j, old, new in changes:
+            for k, symmetry in enumerate(SYMMETRIES):
+                x, y = transform_move((i, j), symmetry, rows, cols)
+                hashes[k] ^= key(x, y, old) ^ key(x, y, new)
+        return tuple(hashes)
+
+
+# Shared by every tree so hashes stored in a transposition table stay comparable
+ZOBRIST = ZobristHasher()
+
+
+# The symmetries of a rectangular board as (flip rows, flip cols): identity, upside down,
+# left to right, and both (a 180 degree turn). The overflow rules and evaluate_board treat a
+# mirrored board exactly like the original, and each symmetry is its own inverse.
+SYMMETRIES = [(False, False), (True, False), (False, True), (True, True)]
+
+
+"""
+transform_move(move, symmetry, rows, cols)
 
+arguments:
+move - Tuple (row, col).
+symmetry - One of SYMMETRIES.
+rows, cols - Size of the board.
+
+return:
+The cell move is mapped to when the board is mirrored by symmetry.
+"""
+def transform_move(move, symmetry, rows, cols):
+    i, j = move
+    if symmetry[0]:
+        i = rows - 1 - i
+    if symmetry[1]:
+        j = cols - 1 - j
+    return (i, j)
+
+
+"""
+transform_board(board, symmetry)
+
+return:
+A new board: board mirrored by symmetry.
+"""
+def transform_board(board, symmetry):
+    rows = board[::-1] if symmetry[0] else board
+    return [row[::-1] if symmetry[1] else row.copy() for row in rows]
+
+
+"""
+move_orbits(board, moves)
+
+arguments:
+board - 2D list representing the game board.
+moves - List of moves on board.
+
+functionality:
+Groups moves that lead to mirror images of each other. That only happens when the board is its own
+mirror image under some symmetry; the moves in a group then have exactly the same minimax score,
+so only one of them has to be searched.
+
+return:
+Dictionary mapping the first move of each group in row-major order to the other moves in the group.
+"""
+def move_orbits(board, moves):
+    rows = len(board)
+    cols = len(board[0])
+    symmetries = [symmetry for symmetry in SYMMETRIES[1:] if transform_board(board, symmetry) == board]
+    orbits = {}
+    seen = {}
+    for move in sorted(moves):
+        if move in seen:
+            orbits[seen[move]].append(move)
+            continue
+        orbits[move] = []
+        for symmetry in symmetries:
+            seen.setdefault(transform_move(move, symmetry, rows, cols), move)
+    return orbits
 
+
+"""
+MoveOrdering class:
+reorders a node's children so an alpha-beta search meets strong moves first and prunes more
+"""
+class MoveOrdering:
     """
-    clear_tree()
+    MoveOrdering.__init__(use_tt_move, use_killers, use_history, use_overflow_guess)
 
     arguments:
-    None. Operates on the GameTree object it is called upon.
+    use_tt_move - Put the best move stored in the transposition table first (default: True).
+    use_killers - Next, try the (up to two) moves that last caused a cutoff at the same depth (default: True).
+    use_history - Then prefer moves that have caused cutoffs anywhere, weighted by remaining depth (default: True).
+    use_overflow_guess - Break remaining ties by putting moves that make the cell overflow first (default: True).
 
     functionality:
-    Recursively traverses the game tree, starting from the root, and clears all references to child nodes.
-    This method helps in freeing up memory by ensuring that the garbage collector can reclaim the memory
-    used by the nodes of the game tree. It's particularly useful to call this method before discarding
-    a GameTree object or before starting a new game.
+    Creates an ordering with empty killer and history tables. One MoveOrdering can be shared by
+    the trees of an iterative deepening search so the tables carry over between depths.
 
     return:
-    None. The game tree is cleared in-place.
+    None.
     """
-    def clear_tree(self):
-        # Recursive helper function
-        def recursive_clear(node):
-            # If the node is not None
-            if node:  
-                for child in node.children:
-                    # Recursively clear each child
-                    recursive_clear(child)  
-                # Remove all children from the current node
-                node.children = []  
+    def __init__(self, use_tt_move = True, use_killers = True, use_history = True, use_overflow_guess = True):
+        self.use_tt_move = use_tt_move
+        self.use_killers = use_killers
+        self.use_history = use_history
+        self.use_overflow_guess = use_overflow_guess
+        # depth -> list of up to two moves that caused a cutoff there, newest first
+        self.killers = {}
+        # move -> accumulated cutoff weight
+        self.history = {}
 
-        # Start the clearing process from the root
-        recursive_clear(self.root)  
-        # Remove the reference to the root node as well
-        self.root = None  
+    """
+    order(node, tt_move)
+
+    arguments:
+    node - An expanded Node whose children should be reordered.
+    tt_move - Best move stored for the node's position, or None.
+
+    functionality:
+    Sorts node.children in place, most promising first. The sort is stable, so moves that tie on
+    every heuristic keep their row-major order.
+
+    return:
+    None.
+    """
+    def order(self, node, tt_move = None):
+        priority = self.priority(node.board, node.depth, tt_move)
+        node.children.sort(key=lambda child: priority(child.move), reverse=True)
+
+    """
+    sort_moves(board, depth, moves, tt_move)
+
+    arguments:
+    board - Board the moves are made on.
+    depth - Depth of the position in the search.
+    moves - List of (row, col) moves, sorted in place.
+    tt_move - Best move stored for the position, or None.
+
+    functionality:
+    Same as order, for searches that work on plain move lists instead of Nodes.
+
+    return:
+    None.
+    """
+    def sort_moves(self, board, depth, moves, tt_move = None):
+        moves.sort(key=self.priority(board, depth, tt_move), reverse=True)
+
+    """
+    priority(board, depth, tt_move)
+
+    functionality:
+    Builds the sort key used by order and sort_moves: higher keys are searched first.
+
+    return:
+    Function mapping a (row, col) move to a comparable tuple.
+    """
+    def priority(self, board, depth, tt_move = None):
+        # Cell overflows once it holds as many gems as it has neighbours
+        limits = _board_layout(len(board), len(board[0]))[0]
+        killers = self.killers.get(depth, []) if self.use_killers else []
+        history = self.history if self.use_history else {}
+
+        def key(move):
+            i, j = move
+            guess = 0
+            if self.use_overflow_guess:
+                guess = abs(board[i][j]) + 1 >= limits[i][j]
+            return (self.use_tt_move and move == tt_move,
+                    move in killers,
+                    history.get(move, 0),
+                    guess)
+
+        return key
+
+    """
+    cutoff(depth, move, remaining)
+
+    arguments:
+    depth - Depth of the node where the cutoff happened.
+    move - Move that caused the cutoff.
+    remaining - Plies that were left to search below that node.
+
+    functionality:
+    Records a move that refuted its siblings, as a killer for that depth and in the history table.
+
+    return:
+    None.
+    """
+    def cutoff(self, depth, move, remaining):
+        killers = self.killers.setdefault(depth, [])
+        if move in killers:
+            killers.remove(move)
+        killers.insert(0, move)
+        del killers[2:]
+        self.history[move] = self.history.get(move, 0) + remaining * remaining
+
+
+"""
+SearchStats class:
+what one search did and where its time went, filled in by GameTree when passed as stats
+"""
+class SearchStats:
+    # Parts of the search the wall time is split between. "backup" is everything not in the other three:
+    # backing scores up the tree, creating nodes, move ordering and transposition table work.
+    PHASES = ("move_generation", "overflow", "evaluation", "backup")
+
+    """
+    SearchStats.__init__()
+
+    functionality:
+    Creates empty statistics. One object can be passed to several searches (for example every depth
+    of iterative_deepening) and adds their numbers up.
+
+    return:
+    None.
+    """
+    def __init__(self):
+        # depth -> number of positions created at that depth (the root is depth 0)
+        self.nodes_per_depth = {}
+        self.leaves = 0
+        self.cutoffs = 0
+        self.terminal_nodes = 0
+        # Estimated nodes not built below those finished games (see skipped_below)
+        self.terminal_skipped = 0
+        # Moves whose resulting board another move from the same node had already produced
+        self.duplicate_moves = 0
+        self.peak_nodes = 0
+        self.time = dict.fromkeys(self.PHASES, 0.0)
+        self.total_time = 0.0
+        # How the move was found: "search", "book", "ponder" or "parallel"
+        self.source = "search"
+
+    """
+    timed(phase, function, leaves)
+
+    arguments:
+    phase - One of PHASES.
+    function - The function to time.
+    leaves - Optional function of the call's arguments giving how many leaves the call evaluates.
+
+    return:
+    A function that calls function and adds the time it took to phase.
+    """
+    def timed(self, phase, function, leaves = None):
+        def wrapper(*args):
+            start = time.perf_counter()
+            result = function(*args)
+            self.time[phase] += time.perf_counter() - start
+            if leaves is not None:
+                self.leaves += leaves(args)
+            return result
+        return wrapper
+
+    def add_nodes(self, depth, count = 1):
+        self.nodes_per_depth[depth] = self.nodes_per_depth.get(depth, 0) + count
+
+    """
+    finish(elapsed, peak_nodes, cutoffs, terminal_nodes, duplicate_moves, terminal_skipped)
+
+    functionality:
+    Adds the totals of a finished search; the time not spent in the timed phases goes to "backup".
+
+    return:
+    None.
+    """
+    def finish(self, elapsed, peak_nodes, cutoffs, terminal_nodes, duplicate_moves = 0, terminal_skipped = 0):
+        timed = sum(self.time[phase] for phase in self.PHASES[:-1])
+        self.total_time += elapsed
+        self.time["backup"] = max(0.0, self.total_time - timed)
+        self.peak_nodes = max(self.peak_nodes, peak_nodes)
+        self.cutoffs += cutoffs
+        self.terminal_nodes += terminal_nodes
+        self.terminal_skipped += terminal_skipped
+        self.duplicate_moves += duplicate_moves
+
+    def node_count(self):
+        return sum(self.nodes_per_depth.values())
+
+    def nodes_per_second(self):
+        return self.node_count() / self.total_time if self.total_time > 0 else 0.0
+
+    """
+    effective_branching_factor()
+
+    functionality:
+    Finds the branching factor b a uniform tree as deep as the search would need to hold the same
+    number of non-root nodes: b + b**2 + ... + b**depth = nodes.
+
+    return:
+    Float, 0.0 if nothing below the root was searched.
+    """
+    def effective_branching_factor(self):
+        depth = max((d for d, count in self.nodes_per_depth.items() if count and d > 0), default=0)
+        nodes = self.node_count() - self.nodes_per_depth.get(0, 0)
+        if depth == 0 or nodes <= 0:
+            return 0.0
+        low, high = 0.0, float(max(nodes, 1))
+        for _ in range(100):
+            b = (low + high) / 2
+            if sum(b ** d for d in range(1, depth + 1)) < nodes:
+                low = b
+            else:
+                high = b
+        return (low + high) / 2
+
+    """
+    as_dict()
+
+    return:
+    The statistics as a plain dictionary, ready to be logged.
+    """
+    def as_dict(self):
+        return {
+            "source": self.source,
+            "nodes": self.node_count(),
+            "nodes_per_depth": dict(sorted(self.nodes_per_depth.items())),
+            "leaves": self.leaves,
+            "cutoffs": self.cutoffs,
+            "terminal_nodes": self.terminal_nodes,
+            "terminal_skipped": self.terminal_skipped,
+            "duplicate_moves": self.duplicate_moves,
+            "effective_branching_factor": round(self.effective_branching_factor(), 3),
+            "peak_nodes": self.peak_nodes,
+            "nodes_per_second": round(self.nodes_per_second()),
+            "time": dict(self.time),
+            "total_time": self.total_time,
+        }
+
+
+"""
+SearchTimeout
+
+functionality:
+Raised inside a GameTree search when its deadline passes or it is cancelled, abandoning the unfinished tree.
+"""
+class SearchTimeout(Exception):
+    pass
+
+
+"""
+search_stopped(deadline, cancel)
+
+arguments:
+deadline - Optional time.perf_counter() value.
+cancel - Optional threading.Event.
+
+return:
+True if the deadline has passed or cancel has been set, so the search should raise SearchTimeout.
+"""
+def search_stopped(deadline, cancel):
+    if deadline is not None and time.perf_counter() >= deadline:
+        return True
+    return cancel is not None and cancel.is_set()
+
+
+"""
+multi_pv_floor(scores, multi_pv)
+
+arguments:
+scores - Scores of the root moves searched so far.
+multi_pv - How many of the best root moves must be scored exactly.
+
+return:
+The alpha to search the next root move with: one below the multi_pv-th best score so far, so a move
+that ties it still comes back exact (scores are integers), or -inf while fewer moves have been scored.
+"""
+def multi_pv_floor(scores, multi_pv):
+    if len(scores) < multi_pv:
+        return -float('inf')
+    return sorted(scores, reverse=True)[multi_pv - 1] - 1
+
+
+"""
+skipped_below(branching, remaining)
+
+arguments:
+branching - Number of valid moves at a finished game's position.
+remaining - Plies a full search would still have gone below it.
+
+return:
+Estimate of the nodes a search saves by not expanding the position: branching + branching**2 + ...
++ branching**remaining, as if every position below had as many moves as this one.
+"""
+def skipped_below(branching, remaining):
+    return sum(branching ** k for k in range(1, remaining + 1))
+
+
+class GameTree:
+    """
+    GameTree.Node.__init__(board, depth, player, tree_height, score, move, key)
+
+    arguments:
+    board - 2D list representing the state of the game board.
+    depth - Current depth in the game tree.
+    player - Current player (1 or -1).
+    tree_height - Maximum height of the game tree.
+    score - Evaluation score of the node (None if not evaluated).
+    move - The move that led to this board state (None if root).
+    key - Zobrist hash of the board (None unless the tree uses a transposition table).
+
+    functionality:
+    Initializes a Node in the GameTree. Sets up the game board associated with this node,
+    the depth in the tree, the player's turn, and optionally the score and move that led to this state.
+    The node initializes an empty list for children nodes to be added during tree expansion.
+    terminal records whether the game is over at this node (None until GameTree.is_terminal checks);
+    a finished game is scored without being expanded.
+    duplicate_moves lists the other moves from the parent that lead to exactly the same board;
+    with merge_duplicates the tree keeps a single node for all of them (see GameTree.unique_children).
+
+    return:
+    None.
+    """
+    class Node:
+        def __init__(self, board, depth, player, tree_height = 4, score = None, move = None, key = None):
+            self.board = copy_board(board)
+            self.key = key
+            self.depth = depth
+            self.player = player
+            self.height = tree_height
+            # Array that holds child nodes
+            self.children = [] 
+            self.score = score
+            self.move = move
+            # Whether one side has lost every gem here (None until GameTree.is_terminal checks)
+            self.terminal = None
+            self.duplicate_moves = []
+
+
+    """
+    GameTree.__init__(board, player, tree_height, search, deadline, tt, ordering, root_moves, root, symmetry, stats, multi_pv, merge_duplicates, cancel)
+
+    arguments:
+    board - 2D list representing the state of the game board at the root of the game tree.
+    player - The player (1 or -1) the tree is being created for.
+    tree_height - Maximum height of the game tree.
+    search - "minimax" (default), "alphabeta", "inplace" or "streaming".
+    deadline - Optional time.perf_counter() value; SearchTimeout is raised if the tree is still being built then.
+    tt - Optional a2_parta.TranspositionTable used by the alphabeta search. Positions reached again
+    (through another move order, or in an earlier tree sharing the table) reuse the stored result
+    instead of being searched again.
+    ordering - Optional MoveOrdering used by the alphabeta search to try likely best moves first.
+    root_moves - Optional list of moves; if given, only these moves are considered at the root.
+    root - Optional Node for board kept from an earlier tree (see ReusedSearch); its existing
+    children are reused instead of being generated again.
+    symmetry - If True, positions are treated the same as their mirror images (see SYMMETRIES):
+    when the root board is its own mirror image only one move of each mirrored group is searched and the
+    others are given its score, and transposition table entries are keyed on the canonical (smallest)
+    of a position's four symmetric hashes, so a mirrored position reuses the stored result.
+    stats - Optional SearchStats to fill in. Without it the search is not instrumented at all.
+    multi_pv - How many of the best root moves the alphabeta and inplace searches score exactly (default: 1),
+    for ranked_moves(). minimax scores every root move exactly anyway.
+    merge_duplicates - If True, a move that settles to the same board as an earlier sibling is not
+    searched again (see unique_children); not used with search="inplace" (default: False).
+    cancel - Optional threading.Event; once it is set, SearchTimeout is raised at the same points the
+    deadline is checked, so another thread can stop the search.
+
+    functionality:
+    Initializes the GameTree object with the root node set to the given board state.
+    With search="minimax", calls create_tree to recursively build the game tree to the specified height
+    and applies the minimax algorithm to evaluate and score the nodes.
+    With search="alphabeta", children are generated on demand by alphabeta and branches that cannot
+    change the result are never built.
+    With search="inplace", the search is done by InPlaceSearch on a single working board and only the
+    root and its scored children are kept as Nodes (tt and root are not used in this mode).
+    With search="streaming", the tree is built depth first: each child is created, scored with the
+    minimax rules and dropped before the next one is built, so no pruning is done but memory only
+    holds the current path and the root's scored children (tt is not used in this mode).
+    get_move() returns the same move in every mode.
+
+    return:
+    None.
+    """
+    def __init__(self, board, player, tree_height = 4, search = "minimax", deadline = None, tt = None, ordering = None, root_moves = None, root = None, symmetry = False, stats = None, multi_pv = 1, merge_duplicates = False, cancel = None):
+        start = time.perf_counter()
+        self.player = player
+        self.board = copy_board(board)
+        self.deadline = deadline
+        self.cancel = cancel
+        self.tt = tt
+        self.ordering = ordering
+        self.root_moves = root_moves
+        self.symmetry = symmetry
+        self.merge_duplicates = merge_duplicates
+        self.search_mode = search
+        # Number of nodes created, including the root
+        self.node_count = 1
+        # Number of finished games found inside the tree, which were scored without being expanded,
+        # and an estimate of how many nodes a search without that check would have built below them
+        self.terminal_count = 0
+        self.terminal_skipped = 0
+        # Number of times the alphabeta search stopped looking at a node's children early
+        self.cutoff_count = 0
+        # Number of moves not searched because a sibling move had already produced the same board
+        self.duplicate_count = 0
+        self.multi_pv = multi_pv
+        # Filled in by ranked_moves(); principal variations of root moves not kept as subtrees, by move
+        self.ranking = None
+        self.root_pvs = {}
+        self.mirrors = {}
+        self.duplicates = {}
+        # Search steps; with stats they are wrapped to time themselves
+        self.stats = stats
+        self.valid_moves = valid_moves
+        self.apply_move = apply_move
+        self.evaluate_board = evaluate_board
+        self.evaluate_boards = evaluate_boards
+        if stats is not None:
+            stats.add_nodes(0)
+            self.valid_moves = stats.timed("move_generation", valid_moves)
+            self.apply_move = stats.timed("overflow", apply_move)
+            self.evaluate_board = stats.timed("evaluation", evaluate_board, lambda args: 1)
+            self.evaluate_boards = stats.timed("evaluation", evaluate_boards, lambda args: len(args[0]))
+        # Perspective minimax scores the leaves from: the root's children keep the root's, and it flips at every level below
+        self.leaf_perspective = player if tree_height <= 2 else player * (-1) ** (tree_height - 2)
+        orbits = {}
+        if symmetry:
+            # Search one move per group of mirrored root moves
+            moves = valid_moves(self.board, player)
+            if root_moves is not None:
+                moves = [move for move in moves if move in root_moves]
+            orbits = move_orbits(self.board, moves)
+            self.root_moves = root_moves = list(orbits)
+        if root is None:
+            # Define the root
+            key = None
+            if tt is not None:
+                key = ZOBRIST.hash_symmetric(self.board) if symmetry else ZOBRIST.hash_board(self.board)
+            self.root = self.Node(self.board, 0, player, tree_height, key = key) 
+        else:
+            # Continue from a subtree kept from an earlier search
+            self.root = root
+        if search == "minimax":
+            # Create tree with self.root as starting point
+            self.create_tree(self.root) 
+            # Score every leaf in one batch before backing the scores up
+            self.score_leaves()
+            # Minimax algorithm to determine score of nodes
+            self.minimax(self.root, player) 
+        elif search == "alphabeta":
+            # Build and score the tree in one pass, skipping branches that cannot matter
+            self.alphabeta(self.root, player, -float('inf'), float('inf'))
+        elif search == "streaming":
+            # Full minimax, but each subtree is dropped as soon as it is scored
+            self.stream(self.root, player)
+        elif search == "inplace":
+            # Search without building the tree; keep only the root's children for get_move()
+            engine = InPlaceSearch(self.board, player, tree_height, ordering=ordering, deadline=deadline, root_moves=root_moves, stats=stats, multi_pv=multi_pv, cancel=cancel)
+            for move, score, pv in engine.search_root():
+                new_board = copy_board(self.board)
+                apply_move(new_board, move[0], move[1], player)
+                self.root.children.append(self.Node(new_board, 1, -player, tree_height, score=score, move=move))
+                self.root_pvs[move] = pv
+            if self.root.children:
+                self.root.score = max(child.score for child in self.root.children)
+            self.node_count = engine.node_count
+            self.terminal_count = engine.terminal_count
+            self.terminal_skipped = engine.terminal_skipped
+            self.cutoff_count = engine.cutoff_count
+        else:
+            raise ValueError("unknown search mode: {}".format(search))
+        self.add_duplicate_children()
+        self.add_mirrored_children(orbits)
+        if stats is not None:
+            # Node-based trees keep every node until they are dropped; the inplace and streaming searches
+            # keep the root's children and one position per level of the current path
+            peak = self.node_count
+            if search in ("inplace", "streaming"):
+                peak = 1 + len(self.root.children) + max(0, tree_height - 2)
+            stats.finish(time.perf_counter() - start, peak, self.cutoff_count, self.terminal_count, self.duplicate_count, self.terminal_skipped)
+
+    """
+    add_duplicate_children()
+
+    functionality:
+    Gives every root move that was folded into an earlier move with the same board (see unique_children)
+    a child of its own, with the score of the child that was searched. As with mirrored moves, the
+    searched move comes first in row-major order, so the copies can never win a tie it did not win.
+
+    return:
+    None.
+    """
+    def add_duplicate_children(self):
+        for child in list(self.root.children):
+            for other in child.duplicate_moves:
+                self.duplicates[other] = child.move
+                self.root.children.append(self.Node(child.board, 1, child.player, child.height,
+                                                    score=child.score, move=other))
+
+    """
+    add_mirrored_children(orbits)
+
+    arguments:
+    orbits - Dictionary from move_orbits for the root board.
+
+    functionality:
+    Gives every mirrored root move that was not searched a child with the same score as the move it mirrors.
+    The searched move is the first of its group in row-major order, so if its score is only a bound,
+    the copies come later and can never win a tie that the searched move itself did not win.
+
+    return:
+    None.
+    """
+    def add_mirrored_children(self, orbits):
+        rows = len(self.board)
+        cols = len(self.board[0])
+        searched = {child.move: child for child in self.root.children}
+        for move, mirrored in orbits.items():
+            child = searched.get(move)
+            if child is None:
+                continue
+            for other in mirrored:
+                if other in searched:
+                    continue
+                symmetry = next(symmetry for symmetry in SYMMETRIES if transform_move(move, symmetry, rows, cols) == other)
+                self.mirrors[other] = (move, symmetry)
+                self.root.children.append(self.Node(transform_board(child.board, symmetry), 1, child.player,
+                                                    child.height, score=child.score, move=other))
+    
+
+    """
+    expand(node)
+
+    argument: 
+    node - A Node object whose children should be generated.
+
+    functionality:
+    Adds one child to node for every valid move of node.player, in row-major order
+    (only the tree's root_moves at the root, if those were given).
+    Each child holds the board after the gem is placed and any overflow has settled.
+    A node where the game is already over (see is_terminal) gets no children.
+    Raises SearchTimeout instead if the tree's deadline has passed or it has been cancelled.
+
+    return: 
+    None. The children are appended to node.children.
+    """
+    def expand(self, node):
+        if search_stopped(self.deadline, self.cancel):
+            raise SearchTimeout()
+        if self.is_terminal(node):
+            return
+
+        for child in self.unique_children(node):
+            node.children.append(child) # Push the child node to the current subtree's children array
+
+    """
+    node_moves(node) / make_child(node, i, j)
+
+    functionality:
+    node_moves lists node.player's valid moves in row-major order (only the tree's root_moves at the root,
+    if those were given). make_child builds the Node for playing (i, j) from node: a copy of the board
+    with the gem placed and any overflow settled, and its hash if the tree keeps hashes.
+
+    return:
+    A list of (row, col) moves / the new child Node (not yet attached to node or counted).
+    """
+    def node_moves(self, node):
+        moves = self.valid_moves(node.board, node.player)
+        if node.depth == 0 and self.root_moves is not None:
+            moves = [move for move in moves if move in self.root_moves]
+        return moves
+
+    def make_child(self, node, i, j):
+        new_board = copy_board(node.board) # Create new board, so you don't affect the root board
+        if node.key is None:
+            self.apply_move(new_board, i, j, node.player) # Add player gem to valid location and overflow the new_board
+            key = None
+        elif self.symmetry:
+            changes = []
+            self.apply_move(new_board, i, j, node.player, changes)
+            key = ZOBRIST.update_symmetric(node.key, changes, len(new_board), len(new_board[0]))
+        else:
+            changes = []
+            self.apply_move(new_board, i, j, node.player, changes)
+            key = ZOBRIST.update(node.key, changes) # Hash follows the cells the move and overflow changed
+        # Create child node based on new board, increased depth, swapped player, height, and move used
+        return self.Node(new_board, node.depth + 1, -node.player, node.height, move=(i, j), key=key)
+
+    """
+    unique_children(node)
+
+    functionality:
+    Builds node's children one at a time, in row-major order of their moves. With merge_duplicates,
+    a child whose board (after the overflow has settled) is exactly the board of an earlier sibling is
+    not yielded: it would have the same subtree and the same score. Its move is added to the first
+    child's duplicate_moves instead and counted in duplicate_count.
+
+    return:
+    A generator of the new child Nodes, one per distinct board.
+    """
+    def unique_children(self, node):
+        seen = {}
+        for i, j in self.node_moves(node):
+            child = self.make_child(node, i, j)
+            if self.merge_duplicates:
+                board_key = tuple(map(tuple, child.board))
+                first = seen.get(board_key)
+                if first is not None:
+                    first.duplicate_moves.append((i, j))
+                    self.duplicate_count += 1
+                    continue
+                seen[board_key] = child
+            self.node_count += 1
+            if self.stats is not None:
+                self.stats.add_nodes(node.depth + 1)
+            yield child
+
+    """
+    is_terminal(node)
+
+    argument:
+    node - A Node object.
+
+    functionality:
+    Checks (once per node) whether one side has lost every gem on node's board, the same test as
+    game.Board.check_win. The root is never terminal, since a move is still wanted there.
+    Each finished game adds its estimated saving (see skipped_below) to terminal_skipped.
+
+    return:
+    True if the game is over at node.
+    """
+    def is_terminal(self, node):
+        if node.terminal is None:
+            node.terminal = node.depth > 0 and EvalState(node.board).winner() != 0
+            if node.terminal:
+                self.terminal_count += 1
+                branching = len(self.valid_moves(node.board, node.player))
+                self.terminal_skipped += skipped_below(branching, node.height - 1 - node.depth)
+        return node.terminal
+
+    """
+    terminal_score(node)
+
+    functionality:
+    Scores a finished game by who won it, relative to the tree's player rather than from leaf_perspective,
+    which at odd tree heights is the opponent's: a win for the root player is 100 and a loss is -100,
+    so a win is never ranked below an unfinished position.
+
+    return:
+    100 or -100.
+    """
+    def terminal_score(self, node):
+        return 100 * EvalState(node.board).winner() * self.player
+
+    """
+    create_tree(subtree)
+
+    argument: 
+    subtree - A Node object representing the current node in the game tree from which the tree will expand.
+
+    functionality:
+    Recursively expands the game tree from the given subtree by iterating over possible moves from the current board state.
+    For each valid move, a new child Node is created with the resulting board state, and create_tree is called recursively
+    until the maximum depth (tree_height) is reached or no more valid moves are available. This process builds out
+    the complete game tree from the perspective of the initial player.
+
+    return: 
+    None. The game tree is built in-place by modifying the children of the Nodes.
+    """
+    def create_tree(self, subtree):
+        # Base case: If depth hits the limit of tree_height, or the game is over, end function
+        if subtree.depth == subtree.height - 1 or self.is_terminal(subtree): 
+            return
+
+        # Add a child for every valid move from this board, unless they are left over from an earlier tree
+        if not subtree.children:
+            self.expand(subtree)
+        
+        # After all possible children have been added to children array, iterating through each child recursively creating the subtree
+        for child in subtree.children:
+            self.create_tree(child) # Recursively continue creating children until base case is reached
+    
+    
+    """
+    score_leaves()
+
+    functionality:
+    Collects every leaf of the built tree (the nodes at depth tree_height - 1) and scores them all with
+    one evaluate_boards call. Every leaf is scored from leaf_perspective, which is exactly the perspective
+    minimax would pass down to it, so minimax can use these scores as they are.
+
+    return:
+    None. The scores are stored in the leaves.
+    """
+    def score_leaves(self):
+        leaves = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.depth == node.height - 1:
+                leaves.append(node)
+            else:
+                stack.extend(node.children)
+        scores = self.evaluate_boards([leaf.board for leaf in leaves], self.leaf_perspective)
+        for leaf, score in zip(leaves, scores):
+            leaf.score = score
+
+    """
+    minimax(node, maximizing_player)
+
+    arguments:
+    node - A Node object representing the current position in the game tree.
+    maximizing_player - Boolean indicating if the current node is evaluated from the perspective of the maximizing player.
+
+    functionality:
+    Applies the minimax algorithm to evaluate the game tree rooted at the given node. For each node, it recursively
+    calculates the optimal score by exploring all possible moves and their outcomes. The function chooses the move
+    that maximizes the player's score if it's the player's turn, and minimizes the score if it's the opponent's turn.
+    The scores are propagated up the tree, allowing the algorithm to determine the best possible move at the root.
+
+    return:
+    Integer representing the score of the node. For leaf nodes, the score is directly calculated from the board state.
+    For internal nodes, the score is derived from the minimax evaluation of its children.
+    """                
+    def minimax(self, node, maximizing_player):
+        # Check if the current node is a leaf node, either because it's reached the
+        # maximum depth or represents a terminal game state (win or lose).
+        if node.depth == node.height - 1:
+            # Leaves are normally scored already, all together, by score_leaves
+            if node.score is None:
+                node.score = self.evaluate_board(node.board, maximizing_player)
+            return node.score
+        if node.terminal:
+            # A finished game is scored straight away, by who won it
+            node.score = self.terminal_score(node)
+            return node.score
+        
+        # If the current node represents the maximizing player's turn.
+        if node.player == maximizing_player:
+            # Initialize the best score for the maximizing player to negative infinity,
+            # ensuring any score will be higher, thus making it possible to find the maximum score.
+            max_eval = -float('inf')
+            for child in node.children:
+                # Recursively call minimax on the child nodes, keeping the perspective of
+                # the maximizing player.
+                eval = self.minimax(child, maximizing_player)
+                # Update max_eval if the current child's evaluation is greater,
+                # effectively choosing the best (maximum) score.
+                max_eval = max(max_eval, eval)
+            # Assign the best score found among children to the current node.
+            node.score = max_eval
+            return node.score
+        else:
+            # If it's the minimizing player's turn, initialize the best score
+            # to positive infinity to find the minimum score among children.
+            min_eval = float('inf')
+            for child in node.children:
+                # Recursively call minimax on the child nodes, switching the perspective
+                # to that of the minimizing player (opponent).
+                eval = self.minimax(child, -maximizing_player)
+                # Update min_eval if the current child's evaluation is lower,
+                # effectively choosing the worst (minimum) score from the perspective
+                # of the maximizing player.
+                min_eval = min(min_eval, eval)
+            # Assign the worst score found among children to the current node.
+            node.score = min_eval
+            return node.score
+
+
+    """
+    stream(node, maximizing_player)
+
+    arguments:
+    node - A Node object representing the current position.
+    maximizing_player - The perspective the node is evaluated from, passed down exactly as minimax does.
+
+    functionality:
+    Computes the same score as create_tree followed by minimax, visiting the same nodes, but builds one
+    child at a time and lets it go once it is scored. Only the root keeps its children, without their
+    subtrees, so get_move() works as usual.
+
+    return:
+    Integer score of the node.
+    """
+    def stream(self, node, maximizing_player):
+        if node.depth == node.height - 1:
+            node.score = self.evaluate_board(node.board, maximizing_player)
+            return node.score
+        if self.is_terminal(node):
+            node.score = self.terminal_score(node)
+            return node.score
+        if search_stopped(self.deadline, self.cancel):
+            raise SearchTimeout()
+
+        if node.player == maximizing_player:
+            best = -float('inf')
+            child_perspective = maximizing_player
+        else:
+            best = float('inf')
+            # Perspective flips exactly as in minimax
+            child_perspective = -maximizing_player
+        for child in self.unique_children(node):
+            score = self.stream(child, child_perspective)
+            if node.player == maximizing_player:
+                best = max(best, score)
+            else:
+                best = min(best, score)
+            if node.depth == 0:
+                node.children.append(child)
+        node.score = best
+        return best
+
+    """
+    alphabeta(node, maximizing_player, alpha, beta)
+
+    arguments:
+    node - A Node object representing the current position in the game tree.
+    maximizing_player - The player (1 or -1) whose perspective the node is evaluated from, passed down exactly as minimax does.
+    alpha - The score the maximizing side is already guaranteed higher up the tree.
+    beta - The score the minimizing side is already guaranteed higher up the tree.
+
+    functionality:
+    Computes the same value as minimax, but expands children only when the node is reached and
+    stops looking at a node's remaining children once alpha >= beta, because the parent would never
+    choose that node. Scores are fail-soft: a node that is cut off gets a bound on its real value
+    (at most alpha, or at least beta), which is never better than the move already found,
+    so get_move() still picks the same move as full minimax.
+    With a transposition table, results are stored per (board, player to move, perspective) and only
+    reused for the same remaining depth, because deeper results are scored from a different perspective.
+    With a move ordering, children are sorted before they are searched; at the root, a child that comes
+    before the current best in row-major order is searched with a window one point wider, so a tie is
+    scored exactly and get_move() can still break it in row-major order like minimax.
+
+    return:
+    Integer score of the node (exact when it lies strictly between alpha and beta).
+    """
+    def alphabeta(self, node, maximizing_player, alpha, beta):
+        # Same leaf tests as minimax
+        if node.depth == node.height - 1:
+            node.score = self.evaluate_board(node.board, maximizing_player)
+            return node.score
+        if self.is_terminal(node):
+            node.score = self.terminal_score(node)
+            return node.score
+
+        tt_key = None
+        tt_move = None
+        remaining = node.height - 1 - node.depth
+        if self.tt is not None:
+            h = node.key
+            symmetry = None
+            if self.symmetry:
+                # Key on the canonical mirror image; stored moves are kept in that image's coordinates
+                h = min(node.key)
+                symmetry = SYMMETRIES[node.key.index(h)]
+                rows = len(node.board)
+                cols = len(node.board[0])
+            # Fold whose turn it is and the perspective into the board hash
+            tt_key = h * 4 + (node.player > 0) * 2 + (maximizing_player > 0)
+            entry = self.tt.probe(tt_key)
+            if entry is not None:
+                tt_move = entry[3]
+                if symmetry is not None and tt_move is not None:
+                    tt_move = transform_move(tt_move, symmetry, rows, cols)
+            # The root's score is never taken from the table, since get_move() needs its children
+            if entry is not None and node.depth > 0 and entry[0] == remaining:
+                score, flag = entry[1], entry[2]
+                if flag == TranspositionTable.EXACT or \
+                        (flag == TranspositionTable.LOWER and score >= beta) or \
+                        (flag == TranspositionTable.UPPER and score <= alpha):
+                    node.score = score
+                    return score
+        alpha_orig, beta_orig = alpha, beta
+        best_move = None
+
+        # Generate the children only now that this node is actually being searched
+        if not node.children:
+            self.expand(node)
+            if self.ordering is not None:
+                self.ordering.order(node, tt_move)
+
+        if node.player == maximizing_player:
+            max_eval = -float('inf')
+            root_scores = []
+            for child in node.children:
+                if node.depth == 0 and self.multi_pv > 1:
+                    # Anything that could still make the top multi_pv is scored exactly (ties included)
+                    eval = self.alphabeta(child, maximizing_player, multi_pv_floor(root_scores, self.multi_pv), beta)
+                    root_scores.append(eval)
+                elif node.depth == 0 and best_move is not None and child.move < best_move:
+                    # Scores are integers, so this makes an equal score come back exact
+                    eval = self.alphabeta(child, maximizing_player, alpha - 1, beta)
+                else:
+                    eval = self.alphabeta(child, maximizing_player, alpha, beta)
+                if eval > max_eval or (node.depth == 0 and eval == max_eval and best_move is not None and child.move < best_move):
+                    max_eval = eval
+                    best_move = child.move
+                alpha = max(alpha, eval)
+                # The minimizing parent already has something at least this good for it
+                if alpha >= beta:
+                    self.cutoff_count += 1
+                    if self.ordering is not None:
+                        self.ordering.cutoff(node.depth, child.move, remaining)
+                    break
+            node.score = max_eval
+        else:
+            min_eval = float('inf')
+            for child in node.children:
+                # Perspective flips exactly as in minimax
+                eval = self.alphabeta(child, -maximizing_player, alpha, beta)
+                if eval < min_eval:
+                    min_eval = eval
+                    best_move = child.move
+                beta = min(beta, eval)
+                # The maximizing parent already has something at least this good for it
+                if alpha >= beta:
+                    self.cutoff_count += 1
+                    if self.ordering is not None:
+                        self.ordering.cutoff(node.depth, child.move, remaining)
+                    break
+            node.score = min_eval
+
+        if tt_key is not None:
+            if node.score <= alpha_orig:
+                flag = TranspositionTable.UPPER
+            elif node.score >= beta_orig:
+                flag = TranspositionTable.LOWER
+            else:
+                flag = TranspositionTable.EXACT
+            if symmetry is not None and best_move is not None:
+                best_move = transform_move(best_move, symmetry, rows, cols)
+            self.tt.store(tt_key, remaining, node.score, flag, best_move)
+        return node.score
+
+
+    """
+    ranked_moves(k)
+
+    arguments:
+    k - How many moves to return (default: multi_pv, or every root move for a minimax tree).
+
+    functionality:
+    Ranks the root moves by score, best first, ties in row-major order, each with its principal
+    variation: the line of play both sides are expected to follow from it. The ranking is worked out
+    from the finished search once and kept on the tree, so later calls cost nothing.
+    In alphabeta and inplace trees only the top multi_pv scores are exact; the rest are upper bounds.
+
+    return:
+    List of (move, score, pv) tuples, pv being a list of moves starting with move.
+    """
+    def ranked_moves(self, k = None):
+        if self.ranking is None:
+            ranking = [(child.move, child.score, self.principal_variation(child)) for child in self.root.children]
+            ranking.sort(key=lambda entry: (-entry[1], entry[0]))
+            self.ranking = ranking
+        if k is None:
+            k = len(self.ranking) if self.multi_pv == 1 and self.search_mode == "minimax" else self.multi_pv
+        return self.ranking[:k]
+
+    """
+    principal_variation(child)
+
+    arguments:
+    child - A child Node of the root.
+
+    functionality:
+    Follows the tree down from child, each time to the first child (in row-major order) whose score
+    is the score its parent took. Lines stop where the tree does: at a leaf, a finished game, or a node
+    scored from the transposition table.
+
+    return:
+    List of moves starting with child.move.
+    """
+    def principal_variation(self, child):
+        if child.move in self.duplicates:
+            searched = next(node for node in self.root.children if node.move == self.duplicates[child.move])
+            return [child.move] + self.principal_variation(searched)[1:]
+        if child.move in self.mirrors:
+            move, symmetry = self.mirrors[child.move]
+            rows = len(self.board)
+            cols = len(self.board[0])
+            searched = next(node for node in self.root.children if node.move == move)
+            return [transform_move(step, symmetry, rows, cols) for step in self.principal_variation(searched)]
+        if child.move in self.root_pvs:
+            return list(self.root_pvs[child.move])
+        line = [child.move]
+        node = child
+        while node.children:
+            node = next((c for c in sorted(node.children, key=lambda c: c.move) if c.score == node.score), None)
+            if node is None:
+                break
+            line.append(node.move)
+        return line
+
+    """
+    get_move()
+
+    arguments:
+    None. Operates on the GameTree object it is called upon.
+
+    functionality:
+    Determines the best move to make from the current board state. It iterates over all direct children of the root node,
+    evaluating their scores to choose the move that leads to the best outcome based on the minimax algorithm.
+    Children are visited in row-major order of their moves (even if a move ordering sorted them differently),
+    so ties always go to the first move in row-major order.
+    This method assumes that the game tree has already been built and evaluated.
+
+    return:
+    Tuple (row, col) indicating the best move's coordinates on the board. If no move can improve the position, or in case of error,
+    the return value may be None.
+    """
+    def get_move(self):
+        # Empty variable to store best array
+        best_move = None 
+
+        # Initializing to -inf, so best_score will always update on first comparison
+        best_score = -float('inf')  
+
+        # Iterate through the self.root children to find best score
+        for child in sorted(self.root.children, key=lambda child: child.move): 
+            if child.score > best_score:
+                best_score = child.score
+                best_move = child.move  
+                
+        return best_move
+
+
+    """
+    clear_tree()
+
+    arguments:
+    None. Operates on the GameTree object it is called upon.
+
+    functionality:
+    Recursively traverses the game tree, starting from the root, and clears all references to child nodes.
+    This method helps in freeing up memory by ensuring that the garbage collector can reclaim the memory
+    used by the nodes of the game tree. It's particularly useful to call this method before discarding
+    a GameTree object or before starting a new game.
+
+    return:
+    None. The game tree is cleared in-place.
+    """
+    def clear_tree(self):
+        # Recursive helper function
+        def recursive_clear(node):
+            # If the node is not None
+            if node:  
+                for child in node.children:
+                    # Recursively clear each child
+                    recursive_clear(child)  
+                # Remove all children from the current node
+                node.children = []  
+
+        # Start the clearing process from the root
+        recursive_clear(self.root)  
+        # Remove the reference to the root node as well
+        self.root = None  
+
+
+
+"""
+InPlaceSearch class:
+an alpha-beta search that makes and unmakes moves on one working board instead of building Nodes
+"""
+class InPlaceSearch:
+    """
+    InPlaceSearch.__init__(board, player, tree_height, ordering, deadline, root_moves, stats, multi_pv, cancel)
+
+    arguments:
+    board - 2D list representing the board at the root (copied; the caller's board is not changed).
+    player - The player (1 or -1) the search is for.
+    tree_height - Height of the search, counted the same way as GameTree's tree_height.
+    ordering - Optional MoveOrdering used to sort the moves at every position.
+    deadline - Optional time.perf_counter() value after which SearchTimeout is raised.
+    root_moves - Optional list of moves; if given, only these moves are considered at the root.
+    stats - Optional SearchStats to fill in.
+    multi_pv - How many of the best root moves to score exactly (default: 1).
+    cancel - Optional threading.Event; SearchTimeout is raised once it is set, as for the deadline.
+
+    functionality:
+    Sets up the working board. Each move is applied to it in place with a1_partd.apply_move, which records
+    the cells it changed, and taken back with a1_partd.revert_move once its subtree has been searched.
+    No board copies or Node objects are made, so memory is O(tree_height): one move list and one
+    change list per level of the current path. An EvalState follows the same changes, so leaves
+    are scored in O(1) instead of rescanning the board, and finished games are spotted in O(1) and not searched further.
+
+    The scores follow GameTree.minimax exactly (max at the root, min everywhere below, with the
+    perspective flipping at min nodes) rather than negamax's negated scores, because evaluate_board is
+    clamped at 0 and is not zero-sum; negating scores would change which move gets picked.
+
+    return:
+    None.
+    """
+    def __init__(self, board, player, tree_height = 4, ordering = None, deadline = None, root_moves = None, stats = None, multi_pv = 1, cancel = None):
+        self.board = copy_board(board)
+        self.eval = EvalState(self.board)
+        self.player = player
+        self.height = tree_height
+        self.ordering = ordering
+        self.deadline = deadline
+        self.cancel = cancel
+        self.root_moves = root_moves
+        # Number of positions visited, including the root
+        self.node_count = 1
+        # Number of finished games reached, which are scored without searching further,
+        # and the estimated nodes that saves, as in GameTree
+        self.terminal_count = 0
+        self.terminal_skipped = 0
+        self.cutoff_count = 0
+        self.multi_pv = multi_pv
+        # pv[depth] is the best line found below the position being searched at that depth,
+        # as nested (move, rest) pairs so extending a line never copies it
+        self.pv = [None] * max(tree_height, 1)
+        # Search steps; with stats they are wrapped to time themselves, as in GameTree
+        self.stats = stats
+        self.valid_moves = valid_moves
+        self.apply_move = apply_move
+        self.revert_move = revert_move
+        if stats is not None:
+            self.valid_moves = stats.timed("move_generation", valid_moves)
+            self.apply_move = stats.timed("overflow", apply_move)
+            self.revert_move = stats.timed("overflow", revert_move)
+            self.eval.update = stats.timed("evaluation", self.eval.update)
+            self.eval.revert = stats.timed("evaluation", self.eval.revert)
+            self.eval.score = stats.timed("evaluation", self.eval.score, lambda args: 1)
+
+    """
+    search_root()
+
+    functionality:
+    Scores every root move. Moves are searched in the ordering's order, but a move that comes before
+    the current best in row-major order is searched with a window one point wider, so the best move
+    (ties going to the first in row-major order) always has an exact score.
+
+    return:
+    List of (move, score, pv) in the order searched, pv being the line expected to follow move.
+    A score that could not make the top multi_pv moves found before it may be an upper bound rather
+    than exact. Empty if tree_height is 1 or less.
+    """
+    def search_root(self):
+        if self.height <= 1:
+            return []
+        board = self.board
+        player = self.player
+        moves = self.valid_moves(board, player)
+        if self.root_moves is not None:
+            moves = [move for move in moves if move in self.root_moves]
+        if self.ordering is not None:
+            self.ordering.sort_moves(board, 0, moves)
+
+        results = []
+        alpha = -float('inf')
+        best_score = -float('inf')
+        best_move = None
+        for move in moves:
+            changes = []
+            self.apply_move(board, move[0], move[1], player, changes)
+            self.eval.update(changes)
+            self.node_count += 1
+            if self.stats is not None:
+                self.stats.add_nodes(1)
+            if self.multi_pv > 1:
+                # As in GameTree.alphabeta: anything that could make the top multi_pv is scored exactly
+                score = self.search(-player, player, 1, multi_pv_floor([r[1] for r in results], self.multi_pv), float('inf'))
+            elif best_move is not None and move < best_move:
+                # Scores are integers, so this makes an equal score come back exact
+                score = self.search(-player, player, 1, alpha - 1, float('inf'))
+            else:
+                score = self.search(-player, player, 1, alpha, float('inf'))
+            self.revert_move(board, changes)
+            self.eval.revert(changes)
+            line = [move]
+            rest = self.pv[1]
+            while rest is not None:
+                line.append(rest[0])
+                rest = rest[1]
+            results.append((move, score, line))
+            if score > best_score or (score == best_score and best_move is not None and move < best_move):
+                best_score = score
+                best_move = move
+            alpha = max(alpha, score)
+        return results
+
+    """
+    search(player, maximizing_player, depth, alpha, beta)
+
+    arguments:
+    player - The player to move at this position.
+    maximizing_player - The perspective the position is evaluated from, passed down exactly as GameTree.minimax does.
+    depth - Depth of the position below the root.
+    alpha - The score the maximizing side is already guaranteed higher up.
+    beta - The score the minimizing side is already guaranteed higher up.
+
+    functionality:
+    Fail-soft alpha-beta over the working board, which is left unchanged when the call returns.
+
+    return:
+    Integer score of the position (exact when it lies strictly between alpha and beta).
+    """
+    def search(self, player, maximizing_player, depth, alpha, beta):
+        board = self.board
+        pv = self.pv
+        pv[depth] = None
+        if depth == self.height - 1:
+            return self.eval.score(maximizing_player)
+        if self.eval.winner():
+            self.terminal_count += 1
+            self.terminal_skipped += skipped_below(len(self.valid_moves(board, player)), self.height - 1 - depth)
+            # Scored by who won, as in GameTree.terminal_score
+            return 100 * self.eval.winner() * self.player
+        if search_stopped(self.deadline, self.cancel):
+            raise SearchTimeout()
+
+        moves = self.valid_moves(board, player)
+        if self.ordering is not None:
+            self.ordering.sort_moves(board, depth, moves)
+        remaining = self.height - 1 - depth
+
+        if player == maximizing_player:
+            best = -float('inf')
+            for move in moves:
+                changes = []
+                self.apply_move(board, move[0], move[1], player, changes)
+                self.eval.update(changes)
+                self.node_count += 1
+                if self.stats is not None:
+                    self.stats.add_nodes(depth + 1)
+                score = self.search(-player, maximizing_player, depth + 1, alpha, beta)
+                self.revert_move(board, changes)
+                self.eval.revert(changes)
+                if score > best:
+                    best = score
+                    pv[depth] = (move, pv[depth + 1])
+                alpha = max(alpha, score)
+                if alpha >= beta:
+                    self.cutoff_count += 1
+                    if self.ordering is not None:
+                        self.ordering.cutoff(depth, move, remaining)
+                    break
+        else:
+            best = float('inf')
+            for move in moves:
+                changes = []
+                self.apply_move(board, move[0], move[1], player, changes)
+                self.eval.update(changes)
+                self.node_count += 1
+                if self.stats is not None:
+                    self.stats.add_nodes(depth + 1)
+                # Perspective flips exactly as in GameTree.minimax
+                score = self.search(-player, -maximizing_player, depth + 1, alpha, beta)
+                self.revert_move(board, changes)
+                self.eval.revert(changes)
+                if score < best:
+                    best = score
+                    pv[depth] = (move, pv[depth + 1])
+                beta = min(beta, score)
+                if alpha >= beta:
+                    self.cutoff_count += 1
+                    if self.ordering is not None:
+                        self.ordering.cutoff(depth, move, remaining)
+                    break
+        return best
+
+
+"""
+iterative_deepening(board, player, time_limit, max_height, tt, ordering, symmetry, stats, cancel)
+
+arguments:
+board - 2D list representing the current game board.
+player - The player (1 or -1) to find a move for.
+time_limit - Number of seconds the search may take.
+max_height - Largest tree_height to try (default: 20).
+tt - Optional a2_parta.TranspositionTable shared by every depth.
+ordering - Optional MoveOrdering shared by every depth.
+symmetry - Passed to every GameTree (default: False); a tt must only be shared by searches with the same setting.
+stats - Optional SearchStats every depth adds to, including the one cut short by the time limit.
+cancel - Optional threading.Event passed to every GameTree; setting it ends the search like the time limit.
+
+functionality:
+Runs alpha-beta GameTree searches of height 2, 3, 4, ... (one more ply each time) until the
+time limit is reached, and keeps the move from the deepest search that finished. A search that would
+clearly not finish in the remaining time (predicted to take more than twice that, from how the time grew
+between the two previous depths of the same parity) is not started; otherwise the deadline stops it.
+If not even the first search finishes, the first valid move is returned.
+
+return:
+Tuple (move, height): the chosen (row, col) and the tree_height of the search it came from
+(0 if no search finished).
+"""
+def iterative_deepening(board, player, time_limit, max_height = 20, tt = None, ordering = None, symmetry = False, stats = None, cancel = None):
+    start = time.perf_counter()
+    deadline = start + time_limit
+    moves = valid_moves(board, player)
+    if len(moves) <= 1:
+        # Nothing to choose between
+        return (moves[0] if moves else None), 0
+
+    best_move = moves[0]
+    completed = 0
+    # height -> seconds its search took
+    durations = {}
+    for height in range(2, max_height + 1):
+        iteration_start = time.perf_counter()
+        # Skip a depth that would clearly overrun. Odd and even depths grow differently under alpha-beta,
+        # so the growth is taken over two plies, and height 2 is too small to time reliably.
+        if height - 4 > 2 and height - 4 in durations:
+            predicted = durations[height - 2] * durations[height - 2] / durations[height - 4]
+            if predicted > 2 * (deadline - iteration_start):
+                break
+        try:
+            tree = GameTree(board, player, height, search="alphabeta", deadline=deadline, tt=tt, ordering=ordering, symmetry=symmetry, stats=stats, cancel=cancel)
+        except SearchTimeout:
+            if stats is not None:
+                stats.finish(time.perf_counter() - iteration_start, 0, 0, 0)
+            break
+        best_move = tree.get_move()
+        completed = height
+        durations[height] = max(time.perf_counter() - iteration_start, 1e-6)
+    return best_move, completed
+
+
+"""
+TimeBank class:
+splits a whole-game time allowance between moves
+"""
+class TimeBank:
+    """
+    TimeBank.__init__(total, per_move_limit, expected_moves, min_moves_to_go)
+
+    arguments:
+    total - Seconds available for all of this player's moves in the game.
+    per_move_limit - Optional hard cap on any single move, in seconds.
+    expected_moves - How many moves the player expects to make in a game (default: 30).
+    min_moves_to_go - Never plan for fewer remaining moves than this (default: 10), so a long game
+    does not spend the whole bank on one move.
+
+    functionality:
+    Keeps track of how much of the game's time allowance is left.
+
+    return:
+    None.
+    """
+    def __init__(self, total, per_move_limit = None, expected_moves = 30, min_moves_to_go = 10):
+        self.remaining = total
+        self.per_move_limit = per_move_limit
+        self.expected_moves = expected_moves
+        self.min_moves_to_go = min_moves_to_go
+        self.moves_made = 0
+
+    """
+    budget()
+
+    functionality:
+    Works out how long the next move may take: an even share of the remaining time over the
+    moves still expected, capped by the per-move limit.
+
+    return:
+    Number of seconds for the next move (never negative).
+    """
+    def budget(self):
+        moves_to_go = max(self.expected_moves - self.moves_made, self.min_moves_to_go)
+        seconds = max(self.remaining, 0) / moves_to_go
+        if self.per_move_limit is not None:
+            seconds = min(seconds, self.per_move_limit)
+        return seconds
+
+    """
+    spend(seconds)
+
+    arguments:
+    seconds - Time the move just made actually took.
+
+    functionality:
+    Takes the time used by a move out of the bank.
+
+    return:
+    None.
+    """
+    def spend(self, seconds):
+        self.remaining -= seconds
+        self.moves_made += 1
+
+
+"""
+AdaptiveDepth class:
+picks each move's tree_height from how big the tree is likely to be
+"""
+class AdaptiveDepth:
+    """
+    AdaptiveDepth.__init__(target_time, target_nodes, min_height, max_height)
+
+    arguments:
+    target_time - Seconds a search should take at most (default: None).
+    target_nodes - Nodes a search should visit at most (default: 20000 if neither target is given).
+    min_height - Never search shallower than this (default: 2).
+    max_height - Never search deeper than this (default: 8).
+
+    functionality:
+    Starts with no measurements: until a search has been recorded, every tree is assumed to be searched
+    in full, which keeps the first choices shallow.
+
+    return:
+    None.
+    """
+    def __init__(self, target_time = None, target_nodes = None, min_height = 2, max_height = 8):
+        if target_time is None and target_nodes is None:
+            target_nodes = 20000
+        self.target_time = target_time
+        self.target_nodes = target_nodes
+        self.min_height = min_height
+        self.max_height = max_height
+        # Measured nodes per second, averaged over recent searches
+        self.nodes_per_second = None
+        # height -> measured share of the full tree the search actually visits, averaged over recent searches
+        self.visited_share = {}
+
+    """
+    full_tree_size(board, player, height)
+
+    functionality:
+    Estimates the size of the full tree from the current branching factor: the player to move can play
+    on every empty cell or their own, the opponent likewise, and the two alternate down the tree.
+
+    return:
+    Estimated number of nodes in a full tree of that height.
+    """
+    def full_tree_size(self, board, player, height):
+        empty = mine = theirs = 0
+        for row in board:
+            for value in row:
+                if value == 0:
+                    empty += 1
+                elif (value > 0) == (player > 0):
+                    mine += 1
+                else:
+                    theirs += 1
+        branching = [max(empty + mine, 1), max(empty + theirs, 1)]
+        total = 1
+        level = 1
+        for depth in range(1, height):
+            level *= branching[(depth - 1) % 2]
+            total += level
+        return total
+
+    """
+    estimate(board, player, height)
+
+    functionality:
+    Scales the full tree size by the share of it searches of that height (or the nearest smaller height
+    measured) have really visited.
+
+    return:
+    Tuple (nodes, seconds); seconds is None until a search has been recorded.
+    """
+    def estimate(self, board, player, height):
+        share = 1.0
+        measured = [h for h in self.visited_share if h <= height]
+        if measured:
+            share = self.visited_share[max(measured)]
+        nodes = self.full_tree_size(board, player, height) * share
+        seconds = None if self.nodes_per_second is None else nodes / self.nodes_per_second
+        return nodes, seconds
+
+    """
+    choose(board, player)
+
+    return:
+    The deepest height from min_height to max_height whose estimate fits the node and time targets
+    (min_height if none does, or if there is a time target but no search has been recorded yet).
+    """
+    def choose(self, board, player):
+        best = self.min_height
+        for height in range(self.min_height, self.max_height + 1):
+            nodes, seconds = self.estimate(board, player, height)
+            if self.target_nodes is not None and nodes > self.target_nodes:
+                break
+            # Without a measured speed yet, a time target keeps the search at min_height
+            if self.target_time is not None and (seconds is None or seconds > self.target_time):
+                break
+            best = height
+        return best
+
+    """
+    record(board, player, height, nodes, seconds)
+
+    arguments:
+    board, player, height - The search that was run.
+    nodes - Nodes it visited (GameTree.node_count).
+    seconds - Time it took.
+
+    functionality:
+    Folds the measurement into the running averages of speed and visited share.
+
+    return:
+    None.
+    """
+    def record(self, board, player, height, nodes, seconds):
+        share = nodes / self.full_tree_size(board, player, height)
+        old = self.visited_share.get(height)
+        self.visited_share[height] = share if old is None else (old + share) / 2
+        if seconds > 0:
+            speed = nodes / seconds
+            self.nodes_per_second = speed if self.nodes_per_second is None else (self.nodes_per_second + speed) / 2
+
+
+"""
+_search_root_share(board, player, tree_height, moves)
+
+arguments:
+board - 2D list representing the current game board.
+player - The player (1 or -1) to find a move for.
+tree_height - Height of the search tree.
+moves - The root moves this worker is responsible for.
+
+functionality:
+Runs in a worker process: searches only the given root moves with an ordered alpha-beta GameTree.
+
+return:
+Tuple (score, move) for the best of the given moves, with ties going to the first move in
+row-major order; the score is exact. move is None if none of the moves could be scored.
+"""
+def _search_root_share(board, player, tree_height, moves):
+    tree = GameTree(board, player, tree_height, search="alphabeta", ordering=MoveOrdering(), root_moves=moves)
+    best_move = tree.get_move()
+    for child in tree.root.children:
+        if child.move == best_move:
+            return child.score, best_move
+    return -float('inf'), None
+
+
+def _warm_up(_):
+    # Runs once in each worker so every process is started before the first real search
+    return os.getpid()
+
+
+"""
+ParallelSearch class:
+splits the root moves of a search across a pool of worker processes
+"""
+class ParallelSearch:
+    """
+    ParallelSearch.__init__(workers, tree_height)
+
+    arguments:
+    workers - Number of worker processes (default: the number of CPUs).
+    tree_height - Default height of the search tree (default: 4).
+
+    functionality:
+    Starts the worker processes straight away and keeps them running between searches, so get_move()
+    never pays process start-up. Call close() (or use the object in a with statement) when done.
+
+    return:
+    None.
+    """
+    def __init__(self, workers = None, tree_height = 4):
+        self.workers = workers or os.cpu_count() or 1
+        self.tree_height = tree_height
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        list(self.pool.map(_warm_up, range(self.workers)))
+
+    """
+    get_move(board, player, tree_height)
+
+    arguments:
+    board - 2D list representing the current game board.
+    player - The player (1 or -1) to find a move for.
+    tree_height - Height of the search tree (default: the one given to the constructor).
+
+    functionality:
+    Deals the root moves out round-robin, one share per worker, and has each worker search its share.
+    Each worker returns the exact score of its best move, so taking the highest score (ties going to
+    the first move in row-major order) gives the same move as GameTree(board, player, tree_height).get_move().
+
+    return:
+    Tuple (row, col) of the best move, or None if there is no valid move.
+    """
+    def get_move(self, board, player, tree_height = None):
+        tree_height = tree_height or self.tree_height
+        moves = valid_moves(board, player)
+        shares = [moves[k::self.workers] for k in range(self.workers)]
+        futures = [self.pool.submit(_search_root_share, board, player, tree_height, share)
+                   for share in shares if share]
+
+        best_score = -float('inf')
+        best_move = None
+        for future in futures:
+            score, move = future.result()
+            if move is None:
+                continue
+            if score > best_score or (score == best_score and move < best_move):
+                best_score = score
+                best_move = move
+        return best_move
+
+    """
+    close()
+
+    functionality:
+    Shuts the worker processes down.
+
+    return:
+    None.
+    """
+    def close(self):
+        self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+
+"""
+ReusedSearch class:
+a player-side search that carries the relevant part of each tree over to the next move
+"""
+class ReusedSearch:
+    """
+    ReusedSearch.__init__(player, tree_height, search, ordering)
+
+    arguments:
+    player - The player (1 or -1) moves are found for.
+    tree_height - Height of every search tree (default: 4).
+    search - GameTree search mode (default: "alphabeta").
+    ordering - Optional MoveOrdering for the alphabeta search (default: a new MoveOrdering).
+
+    functionality:
+    Creates a search with no retained tree. Nodes reused from earlier trees are counted in reused_nodes.
+
+    return:
+    None.
+    """
+    def __init__(self, player, tree_height = 4, search = "alphabeta", ordering = None):
+        self.player = player
+        self.tree_height = tree_height
+        self.search = search
+        self.ordering = ordering if ordering is not None else MoveOrdering()
+        self.tree = None
+        self.reused_nodes = 0
+
+    """
+    get_move(board, stats, cancel)
+
+    arguments:
+    board - 2D list representing the current game board.
+    stats - Optional SearchStats for the search.
+    cancel - Optional threading.Event passed to the GameTree. A cancelled search keeps no tree, so the
+    next move is searched from scratch.
+
+    functionality:
+    Looks for board among the grandchildren of the previous tree's root (our move, then the
+    opponent's reply). If it is there, that subtree is promoted to be the new root: its depths are
+    renumbered, its old scores are dropped and the search extends it to the full tree_height,
+    reusing every board and child list already built. The rest of the old tree is released.
+    Otherwise a new tree is built from scratch.
+
+    return:
+    Tuple (row, col) of the best move.
+    """
+    def get_move(self, board, stats = None, cancel = None):
+        root = self.find_retained(board)
+        self.tree = None  # Release the old tree; only the promoted subtree survives
+        reused = 0
+        if root is not None:
+            reused = self.promote(root, 2)
+        self.tree = GameTree(board, self.player, self.tree_height, search=self.search,
+                             ordering=self.ordering, root=root, stats=stats, cancel=cancel)
+        self.reused_nodes += reused
+        return self.tree.get_move()
+
+    """
+    find_retained(board)
+
+    arguments:
+    board - 2D list representing the current game board.
+
+    functionality:
+    Searches the previous tree's grandchildren for a node holding board.
+
+    return:
+    The matching Node, or None.
+    """
+    def find_retained(self, board):
+        if self.tree is None or self.tree.root is None:
+            return None
+        for child in self.tree.root.children:
+            for grandchild in child.children:
+                if grandchild.board == board:
+                    return grandchild
+        return None
+
+    """
+    promote(node, shift)
+
+    arguments:
+    node - The node that becomes the new root.
+    shift - How many plies the node sits below the old root.
+
+    functionality:
+    Renumbers the depths of node's subtree so node is at depth 0, sets every node to the current
+    tree_height and clears the old scores, which were computed for a different tree.
+
+    return:
+    Number of nodes in the promoted subtree.
+    """
+    def promote(self, node, shift):
+        node.move = None
+        # The new root is searched even if it was marked as a finished game
+        node.terminal = None
+        count = 0
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            current.depth -= shift
+            current.height = self.tree_height
+            current.score = None
+            count += 1
+            stack.extend(current.children)
+        return count
+
+
+def _ponder_move(board, player, tree_height, stats = None, cancel = None):
+    return GameTree(board, player, tree_height, search="inplace", ordering=MoveOrdering(), symmetry=True, stats=stats, cancel=cancel).get_move()
+
+
+"""
+PonderingSearch class:
+a player-side search that keeps thinking during the opponent's turn
+"""
+class PonderingSearch:
+    """
+    PonderingSearch.__init__(player, tree_height, workers, max_replies)
+
+    arguments:
+    player - The player (1 or -1) moves are found for.
+    tree_height - Height of every search tree (default: 4).
+    workers - Number of background worker processes (default: 1).
+    max_replies - Most opponent replies to ponder after each move (default: all of them).
+
+    functionality:
+    Starts the background workers straight away. Call close() (or use the object in a with statement) when done.
+    Moves answered from pondering are counted in ponder_hits, and moves that had to be searched in ponder_misses.
+
+    return:
+    None.
+    """
+    def __init__(self, player, tree_height = 4, workers = 1, max_replies = None):
+        self.player = player
+        self.tree_height = tree_height
+        self.max_replies = max_replies
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        list(self.pool.map(_warm_up, range(workers)))
+        # board (as a tuple of rows) -> future for our move there
+        self.pending = {}
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+
+    """
+    get_move(board, stats, cancel)
+
+    arguments:
+    board - 2D list representing the current game board.
+    stats - Optional SearchStats; a pondered answer only records its source ("ponder") and the wait.
+    cancel - Optional threading.Event. Once it is set, a search made here raises SearchTimeout, and
+    no pondering is started for a move that is no longer wanted.
+
+    functionality:
+    If board is one of the positions being pondered, its result is used (waiting for it if it is
+    still running) and the rest of the pondering is cancelled. Otherwise the move is searched here.
+    Either way the move is the one GameTree(board, player, tree_height).get_move() gives, and pondering
+    of the opponent's replies to it starts before it is returned.
+
+    return:
+    Tuple (row, col) of the best move.
+    """
+    def get_move(self, board, stats = None, cancel = None):
+        start = time.perf_counter()
+        future = self.pending.pop(tuple(map(tuple, board)), None)
+        self.cancel()
+        if future is not None:
+            move = future.result()
+            self.ponder_hits += 1
+            if stats is not None:
+                stats.source = "ponder"
+                stats.finish(time.perf_counter() - start, 0, 0, 0)
+        else:
+            move = _ponder_move(board, self.player, self.tree_height, stats, cancel)
+            self.ponder_misses += 1
+        if move is not None and not search_stopped(None, cancel):
+            after = copy_board(board)
+            apply_move(after, move[0], move[1], self.player)
+            self.ponder(after)
+        return move
+
+    """
+    ponder(board)
+
+    arguments:
+    board - 2D list of the position after our move, with the opponent to play.
+
+    functionality:
+    Ranks the opponent's replies with a quick two-ply search from their side, best first, and queues a
+    search of our answer to each of them (up to max_replies) on the background workers.
+
+    return:
+    None.
+    """
+    def ponder(self, board):
+        replies = GameTree(board, -self.player, 2, search="inplace").root.children
+        replies.sort(key=lambda child: (-child.score, child.move))
+        if self.max_replies is not None:
+            replies = replies[:self.max_replies]
+        for child in replies:
+            key = tuple(map(tuple, child.board))
+            if key not in self.pending:
+                self.pending[key] = self.pool.submit(_ponder_move, child.board, self.player, self.tree_height)
+
+    """
+    cancel()
+
+    functionality:
+    Drops all pondering. Searches that have not started are cancelled; one a worker is already running
+    cannot be interrupted, so it finishes and its result is ignored.
+
+    return:
+    None.
+    """
+    def cancel(self):
+        for future in self.pending.values():
+            future.cancel()
+        self.pending = {}
+
+    """
+    close()
+
+    functionality:
+    Cancels any pondering and shuts the worker processes down.
+
+    return:
+    None.
+    """
+    def close(self):
+        self.cancel()
+        self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+"""
+PlayRequests class:
+runs a bot's get_play on a background thread, so a game loop can keep drawing while the bot thinks
+"""
+class PlayRequests:
+    """
+    PlayRequests.__init__(get_play)
+
+    arguments:
+    get_play - The bot's get_play. It is called as get_play(board, *args, cancel=event) and must stop
+    (by raising SearchTimeout, or returning early) soon after the threading.Event is set.
+
+    functionality:
+    The thread is only started by the first request. Call close() when done.
+
+    return:
+    None.
+    """
+    def __init__(self, get_play):
+        self.get_play = get_play
+        self.worker = None
+        self.request = None
+        self.cancel_event = None
+
+    """
+    submit(board, *args)
+
+    functionality:
+    Cancels the outstanding request, if any, and starts get_play on a copy of board, so the caller may
+    change its board meanwhile. Only one search runs at a time.
+
+    return:
+    A concurrent.futures.Future for get_play's result; poll it with done().
+    """
+    def submit(self, board, *args):
+        self.cancel()
+        if self.worker is None:
+            self.worker = ThreadPoolExecutor(max_workers=1)
+        self.cancel_event = threading.Event()
+        self.request = self.worker.submit(self.get_play, [row[:] for row in board], *args, cancel=self.cancel_event)
+        return self.request
+
+    """
+    cancel()
+
+    functionality:
+    Drops the outstanding request. One that has not started is cancelled, and a running search stops
+    at its next check, so the next request does not wait for it (a search split over worker
+    processes is the exception and runs to the end). Either way its result is never used.
+
+    return:
+    None.
+    """
+    def cancel(self):
+        if self.request is not None:
+            self.cancel_event.set()
+            self.request.cancel()
+            self.request = None
+            self.cancel_event = None
+
+    """
+    close()
+
+    functionality:
+    Cancels the outstanding request and shuts the thread down once the search has stopped.
+
+    return:
+    None.
+    """
+    def close(self):
+        self.cancel()
+        if self.worker is not None:
+            self.worker.shutdown()
+            self.worker = None
@@ -0,0 +1,65 @@
+#
+#   Benchmark for the power-of-two (bitmask indexed) ring buffers in a1_partc
+#   To use this, run: python bench_a1_partc.py [operations]
+#
+#   Each container is driven as a long-running queue: it is filled to a steady
+#   depth once, then every round pushes one item and pops one item, so the front
+#   index keeps wrapping round the ring and no resizes happen during timing.
+
+import sys
+import timeit
+
+from a1_partc import Queue, Deque, MaskedQueue, MaskedDeque
+
+
+def queue_rounds(q, rounds):
+    enqueue = q.enqueue
+    dequeue = q.dequeue
+    for i in range(rounds):
+        enqueue(i)
+        dequeue()
+
+
+def deque_rounds(d, rounds):
+    push_back = d.push_back
+    pop_front = d.pop_front
+    push_front = d.push_front
+    pop_back = d.pop_back
+    for i in range(rounds):
+        push_back(i)
+        pop_front()
+        push_front(i)
+        pop_back()
+
+
+def deque_index(d, rounds):
+    n = len(d)
+    for i in range(rounds):
+        d[i % n]
+
+
+def per_op_ns(make, run, rounds, ops_per_round, depth=1000, repeat=5):
+    container = make()
+    fill = container.enqueue if hasattr(container, 'enqueue') else container.push_back
+    for i in range(depth):
+        fill(i)
+    best = min(timeit.repeat(lambda: run(container, rounds), number=1, repeat=repeat))
+    return best / (rounds * ops_per_round) * 1e9
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    cases = [
+        ("Queue enqueue/dequeue", lambda: Queue(1500), lambda: MaskedQueue(1500), queue_rounds, 2),
+        ("Deque push/pop both ends", lambda: Deque(1500), lambda: MaskedDeque(1500), deque_rounds, 4),
+        ("Deque __getitem__", lambda: Deque(1500), lambda: MaskedDeque(1500), deque_index, 1),
+    ]
+    print("{:<28}{:>12}{:>12}{:>10}".format("operation", "% (ns/op)", "& (ns/op)", "speedup"))
+    for name, make_plain, make_masked, run, ops in cases:
+        plain = per_op_ns(make_plain, run, rounds, ops)
+        masked = per_op_ns(make_masked, run, rounds, ops)
+        print("{:<28}{:>12.1f}{:>12.1f}{:>9.2f}x".format(name, plain, masked, plain / masked))
+
+
+if __name__ == '__main__':
+    main()
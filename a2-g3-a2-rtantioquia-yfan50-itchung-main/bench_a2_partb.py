@@ -0,0 +1,94 @@
+#
+#   Benchmarks for the GameTree search modes in a2_partb
+#   To use this, run: python bench_a2_partb.py [tree_height]
+#
+#   Every report runs on the same fixed set of positions, reached by playing
+#   seeded random moves from the standard start position of game.py.
+
+import sys
+import time
+import random
+
+from a1_partd import apply_move
+from a2_partb import EvalState, GameTree, MoveOrdering, valid_moves
+
+
+def start_board(rows=5, cols=6):
+    board = [[0] * cols for _ in range(rows)]
+    board[0][0] = 1
+    board[rows - 1][cols - 1] = -1
+    return board
+
+
+def fixed_positions(count=12, seed=2024):
+    # (board, player to move) pairs spread over the opening and the mid-game
+    rng = random.Random(seed)
+    positions = []
+    for k in range(count):
+        board = start_board()
+        player = 1
+        for _ in range(2 + (k * 3) % 24):
+            i, j = rng.choice(valid_moves(board, player))
+            apply_move(board, i, j, player)
+            player = -player
+        positions.append((board, player))
+    return positions
+
+
+def report_move_ordering(positions, height):
+    configs = [
+        ("no ordering", None),
+        ("overflow guess", dict(use_tt_move=False, use_killers=False, use_history=False)),
+        ("killers", dict(use_tt_move=False, use_history=False, use_overflow_guess=False)),
+        ("history", dict(use_tt_move=False, use_killers=False, use_overflow_guess=False)),
+        ("killers + history", dict(use_overflow_guess=False)),
+        ("all heuristics", dict()),
+    ]
+    print("Nodes visited by alpha-beta, tree_height={}, {} positions".format(height, len(positions)))
+    print("{:<20}{:>12}{:>10}{:>10}".format("ordering", "nodes", "ratio", "seconds"))
+    baseline = None
+    for name, options in configs:
+        nodes = 0
+        start = time.perf_counter()
+        for board, player in positions:
+            ordering = None if options is None else MoveOrdering(**options)
+            nodes += GameTree(board, player, height, search="alphabeta", ordering=ordering).node_count
+        seconds = time.perf_counter() - start
+        baseline = baseline or nodes
+        print("{:<20}{:>12}{:>10.2f}{:>10.2f}".format(name, nodes, nodes / baseline, seconds))
+    print()
+
+
+def report_duplicates(height, games=4, seed=2024):
+    # Self-play games (a fifth of the moves random, so the games differ), counting the moves
+    # that settle to the same board as a sibling and are merged by merge_duplicates
+    rng = random.Random(seed)
+    moves = nodes = duplicates = 0
+    for _ in range(games):
+        board = start_board()
+        player = 1
+        while not EvalState(board).winner():
+            tree = GameTree(board, player, height, merge_duplicates=True)
+            moves += 1
+            nodes += tree.node_count
+            duplicates += tree.duplicate_count
+            move = tree.get_move()
+            if rng.random() < 0.2:
+                move = rng.choice(valid_moves(board, player))
+            apply_move(board, move[0], move[1], player)
+            player = -player
+    print("Duplicate children in {} self-play games, tree_height={}".format(games, height))
+    print("{} moves, {} nodes, {} duplicate moves ({:.4%} of children)".format(
+        moves, nodes, duplicates, duplicates / max(1, nodes + duplicates - moves)))
+    print()
+
+
+def main():
+    height = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    positions = fixed_positions()
+    report_move_ordering(positions, height)
+    report_duplicates(min(height, 3))
+
+
+if __name__ == '__main__':
+    main()
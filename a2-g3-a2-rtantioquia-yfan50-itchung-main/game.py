@@ -14,6 +14,7 @@ import math
 
 from a1_partd import overflow
 from a1_partc import Queue
+from a2_partb import EvalState
 from player1 import PlayerOne
 from player2 import PlayerTwo 
 
@@ -125,22 +126,8 @@ class Board:
 
     def check_win(self):
         if(self.turn > 0):
-            num_p1 = 0
-            num_p2 = 0
-            for i in range(self.height):
-                for j in range(self.width):
-                    if(self.board[i][j] > 0):
-                        if num_p2 > 0:
-                            return 0
-                        num_p1 += 1
-                    elif(self.board[i][j] < 0):
-                        if num_p1 > 0:
-                            return 0
-                        num_p2 += 1
-            if(num_p1 == 0):
-                return -1
-            if(num_p2== 0):
-                return 1
+            # Same gem counters the bots' evaluation uses
+            return EvalState(self.board).winner()
         return 0
 
     def do_overflow(self,q):
@@ -271,17 +258,28 @@ current_player = 0
 board = Board(GRID_SIZE[1], GRID_SIZE[0], p1_sprites, p2_sprites)
 # Game loop
 running = True
-overflow_boards = Queue()
+overflow_boards = Queue(shrink=True)
 overflowing = False
 numsteps = 0
 has_winner = False
 bots = [PlayerOne(), PlayerTwo()]
+# Bot moves still being searched (futures from request_play), so the window keeps updating meanwhile
+pending = [None, None]
 grid_col = -1
 grid_row = -1
 choice = [None, None]
+
+def cancel_bots(players):
+    for p in players:
+        if pending[p] is not None:
+            bots[p].cancel_play()
+            pending[p] = None
+
 while running:
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
+            # Stop the bots' searches so closing the window does not wait for them
+            cancel_bots([0, 1])
             running = False
             
         # UNDO FUNCTION CODE #
@@ -289,6 +287,8 @@ while running:
             # Check if 'u' is pressed for undo AND game isn't won yet
             if event.key == pygame.K_u and not has_winner:
                  if board.undo_move():  # Undo was successful
+                        # A bot move searched for the undone position is no longer wanted
+                        cancel_bots([0, 1])
                         # Optionally, update the status to indicate undo was performed
                         status[1] = "Undo performed"
                         # Switch back to the previous player
@@ -299,6 +299,8 @@ while running:
             player2_dropdown.handle_event(event)
             choice[0] = player1_dropdown.get_choice()
             choice[1] = player2_dropdown.get_choice()
+            # Stop searching for a player who was switched back to Human
+            cancel_bots([p for p in range(2) if choice[p] != 1])
             if event.type == pygame.MOUSEBUTTONDOWN:
                 x,y = event.pos
                 row = y - Y_OFFSET
@@ -332,14 +334,20 @@ while running:
             status[0] = "Player " + str(current_player + 1) + "'s turn"
             make_move = False
             if choice[current_player] == 1:
-                (grid_row,grid_col) = bots[current_player].get_play(board.get_board())
-                status[1] = "Bot chose row {}, col {}".format(grid_row, grid_col)
-                if not board.valid_move(grid_row, grid_col, player_id[current_player]):
-                       has_winner = True
-                       # if p1 makes an invalid move, p2 wins.  if p2 makes an invalid move p1 wins
-                       winner = ((current_player + 1) % 2) + 1 
-                else:
-                    make_move = True
+                if pending[current_player] is None:
+                    # Start the search and keep drawing frames until it is done
+                    pending[current_player] = bots[current_player].request_play(board.get_board())
+                    status[1] = "Bot is thinking"
+                elif pending[current_player].done():
+                    (grid_row,grid_col) = pending[current_player].result()
+                    pending[current_player] = None
+                    status[1] = "Bot chose row {}, col {}".format(grid_row, grid_col)
+                    if not board.valid_move(grid_row, grid_col, player_id[current_player]):
+                           has_winner = True
+                           # if p1 makes an invalid move, p2 wins.  if p2 makes an invalid move p1 wins
+                           winner = ((current_player + 1) % 2) + 1 
+                    else:
+                        make_move = True
             else:
                 if board.valid_move(grid_row, grid_col, player_id[current_player]):
                     make_move = True
@@ -378,5 +386,7 @@ while running:
     pygame.display.update()
     pygame.time.delay(100)
 
+for bot in bots:
+    bot.close()
 pygame.quit()
 sys.exit()
@@ -0,0 +1,380 @@
+#
+#   Monte Carlo Tree Search (UCT) for the gem game, used by player_mcts.PlayerMCTS
+#   MCTS searches one position; ParallelMCTS spreads the playouts over several processes.
+
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from a1_partd import _board_layout, apply_move
+from a2_partb import EvalState, _warm_up, copy_board, search_stopped, valid_moves
+
+"""
+MCTSNode class:
+one position in the Monte Carlo search tree, with the statistics UCT selection needs
+"""
+class MCTSNode:
+    """
+    MCTSNode.__init__(player, move, parent, moves)
+
+    arguments:
+    player - The player (1 or -1) to move from this position.
+    move - The move that led here from the parent (None at the root).
+    parent - The parent MCTSNode (None at the root).
+    moves - Valid moves from this position; an empty list marks a finished game.
+
+    functionality:
+    wins counts playout results from the point of view of the player who made `move`,
+    so a parent can compare its children directly.
+
+    return:
+    None.
+    """
+    def __init__(self, player, move = None, parent = None, moves = None):
+        self.player = player
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = list(moves or [])
+        self.visits = 0
+        self.wins = 0.0
+
+    """
+    select_child(exploration)
+
+    arguments:
+    exploration - UCT exploration constant.
+
+    functionality:
+    Picks the child with the highest UCB1 value: its win rate plus an exploration bonus
+    that grows for children visited less often than their siblings.
+
+    return:
+    The chosen MCTSNode.
+    """
+    def select_child(self, exploration):
+        log_visits = math.log(self.visits)
+        best = None
+        best_value = -float('inf')
+        for child in self.children:
+            value = child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best_value = value
+                best = child
+        return best
+
+
+"""
+play(board, row, col, player, state)
+
+arguments:
+board - 2D list representing the game board, changed in place.
+row, col - The cell the gem is placed on.
+player - The player (1 or -1) making the move.
+state - EvalState for board, kept up to date.
+
+functionality:
+Applies the move with a1_partd.apply_move. A chain reaction long enough to hit the recursion limit
+only happens once the mover has flooded the board, so it is counted as a win for the mover.
+
+return:
+The winner (1 or -1) if the move ended the game, otherwise 0.
+"""
+def play(board, row, col, player, state):
+    changes = []
+    try:
+        apply_move(board, row, col, player, changes)
+    except RecursionError:
+        return player
+    state.update(changes)
+    return state.winner()
+
+
+"""
+MCTS class:
+a Monte Carlo Tree Search (UCT) for one position, run for a playout budget or until a deadline
+"""
+class MCTS:
+    """
+    MCTS.__init__(board, player, playouts, time_limit, policy, exploration, max_plies, seed, cancel)
+
+    arguments:
+    board - 2D list representing the current game board.
+    player - The player (1 or -1) to find a move for.
+    playouts - Number of playouts to run (default: 1000 when no time_limit is given).
+    time_limit - Seconds to search for; with both set, whichever runs out first stops the search.
+    policy - "random" for uniform playouts, or "light" to prefer moves that make a cell overflow (default: "light").
+    exploration - UCT exploration constant (default: sqrt(2)).
+    max_plies - Playouts still undecided after this many moves are scored by gem count (default: 100).
+    seed - Optional seed for the random number generator.
+    cancel - Optional threading.Event; the search stops once it is set, as when the budget runs out.
+
+    functionality:
+    Sets up the root node. No search happens until search() or get_move() is called.
+
+    return:
+    None.
+    """
+    def __init__(self, board, player, playouts = None, time_limit = None, policy = "light",
+                 exploration = math.sqrt(2), max_plies = 100, seed = None, cancel = None):
+        if playouts is None and time_limit is None:
+            playouts = 1000
+        if policy not in ("random", "light"):
+            raise ValueError("policy must be 'random' or 'light'")
+        self.board = copy_board(board)
+        self.player = player
+        self.playout_budget = playouts
+        self.time_limit = time_limit
+        self.policy = policy
+        self.exploration = exploration
+        self.max_plies = max_plies
+        self.rng = random.Random(seed)
+        self.cancel = cancel
+        self.root = MCTSNode(player, moves=valid_moves(self.board, player))
+        # Cell overflows once it holds as many gems as it has neighbours
+        self.limits = _board_layout(len(board), len(board[0]))[0]
+        self.playouts = 0
+        self.elapsed = 0.0
+
+    """
+    search()
+
+    functionality:
+    Runs UCT iterations until the playout budget or the deadline is used up, or cancel is set. Each iteration
+    replays the path from the root on a copy of the board (selection), adds one new child
+    (expansion), plays the game out (simulation) and passes the result back up (backpropagation).
+
+    return:
+    The root MCTSNode.
+    """
+    def search(self):
+        start = time.perf_counter()
+        deadline = None if self.time_limit is None else start + self.time_limit
+        while self.playout_budget is None or self.playouts < self.playout_budget:
+            if search_stopped(deadline, self.cancel):
+                break
+            self.iterate()
+        self.elapsed += time.perf_counter() - start
+        return self.root
+
+    def iterate(self):
+        board = copy_board(self.board)
+        state = EvalState(board)
+        node = self.root
+        winner = 0
+
+        # Selection
+        while not node.untried and node.children:
+            node = node.select_child(self.exploration)
+            winner = play(board, node.move[0], node.move[1], node.parent.player, state)
+
+        # Expansion
+        if node.untried and not winner:
+            move = node.untried.pop(self.rng.randrange(len(node.untried)))
+            winner = play(board, move[0], move[1], node.player, state)
+            moves = [] if winner else valid_moves(board, -node.player)
+            child = MCTSNode(-node.player, move, node, moves)
+            node.children.append(child)
+            node = child
+
+        # Simulation
+        if not winner:
+            winner = self.playout(board, node.player, state)
+
+        # Backpropagation: each node is scored for the player who moved into it
+        while node is not None:
+            node.visits += 1
+            mover = -node.player
+            if winner == mover:
+                node.wins += 1
+            elif winner == 0:
+                node.wins += 0.5
+            node = node.parent
+        self.playouts += 1
+
+    """
+    playout(board, player, state)
+
+    arguments:
+    board - 2D list representing the game board, played on in place.
+    player - The player (1 or -1) to move.
+    state - EvalState for board.
+
+    functionality:
+    Plays moves chosen by the playout policy until someone wins or max_plies moves have been made.
+
+    return:
+    The winner (1 or -1); for an unfinished game the side with more gems, or 0 if level.
+    """
+    def playout(self, board, player, state):
+        rng = self.rng
+        for _ in range(self.max_plies):
+            moves = valid_moves(board, player)
+            if not moves:
+                return -player
+            move = None
+            if self.policy == "light":
+                overflowing = [(i, j) for i, j in moves if abs(board[i][j]) + 1 >= self.limits[i][j]]
+                if overflowing and rng.random() < 0.75:
+                    move = overflowing[rng.randrange(len(overflowing))]
+            if move is None:
+                move = moves[rng.randrange(len(moves))]
+            winner = play(board, move[0], move[1], player, state)
+            if winner:
+                return winner
+            player = -player
+        if state.p1_total != state.p2_total:
+            return 1 if state.p1_total > state.p2_total else -1
+        return 0
+
+    """
+    root_visits()
+
+    return:
+    Dictionary mapping each root move searched so far to its visit count.
+    """
+    def root_visits(self):
+        return {child.move: child.visits for child in self.root.children}
+
+    """
+    playouts_per_second()
+
+    return:
+    Playouts run per second of search time so far (0 before any search).
+    """
+    def playouts_per_second(self):
+        return self.playouts / self.elapsed if self.elapsed > 0 else 0.0
+
+    """
+    get_move()
+
+    functionality:
+    Searches if nothing has been searched yet, then picks the most visited root move
+    (ties going to the first move in row-major order).
+
+    return:
+    Tuple (row, col) of the chosen move, or None if there is no valid move.
+    """
+    def get_move(self):
+        if self.playouts == 0:
+            self.search()
+        return best_visited(self.root_visits())
+
+
+"""
+best_visited(visits)
+
+arguments:
+visits - Dictionary mapping moves to visit counts.
+
+return:
+The most visited move (ties going to the first move in row-major order), or None if visits is empty.
+"""
+def best_visited(visits):
+    best_move = None
+    for move in sorted(visits):
+        if best_move is None or visits[move] > visits[best_move]:
+            best_move = move
+    return best_move
+
+
+def _search_share(board, player, playouts, time_limit, policy, seed):
+    tree = MCTS(board, player, playouts, time_limit, policy, seed=seed)
+    tree.search()
+    return tree.root_visits(), tree.playouts, tree.elapsed
+
+
+"""
+ParallelMCTS class:
+root-parallel Monte Carlo search: every worker process grows its own tree and the visit counts are summed
+"""
+class ParallelMCTS:
+    """
+    ParallelMCTS.__init__(workers, playouts, time_limit, policy)
+
+    arguments:
+    workers - Number of worker processes (default: the number of CPUs).
+    playouts - Total playouts per move, split evenly over the workers (default: 1000 when no time_limit is given).
+    time_limit - Seconds each worker searches for.
+    policy - Playout policy, as for MCTS (default: "light").
+
+    functionality:
+    Starts the worker processes straight away and keeps them between moves. Call close()
+    (or use the object in a with statement) when done.
+
+    return:
+    None.
+    """
+    def __init__(self, workers = None, playouts = None, time_limit = None, policy = "light"):
+        if playouts is None and time_limit is None:
+            playouts = 1000
+        self.workers = workers or os.cpu_count() or 1
+        self.playout_budget = playouts
+        self.time_limit = time_limit
+        self.policy = policy
+        self.rng = random.Random()
+        self.playouts = 0
+        self.elapsed = 0.0
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        list(self.pool.map(_warm_up, range(self.workers)))
+
+    """
+    get_move(board, player)
+
+    arguments:
+    board - 2D list representing the current game board.
+    player - The player (1 or -1) to find a move for.
+
+    functionality:
+    Runs one independently seeded MCTS per worker and picks the move with the most visits summed
+    over all of them. playouts and elapsed hold the totals of the last call.
+
+    return:
+    Tuple (row, col) of the chosen move, or None if there is no valid move.
+    """
+    def get_move(self, board, player):
+        share = None
+        if self.playout_budget is not None:
+            share = max(1, self.playout_budget // self.workers)
+        start = time.perf_counter()
+        futures = [self.pool.submit(_search_share, board, player, share, self.time_limit,
+                                    self.policy, self.rng.getrandbits(32))
+                   for _ in range(self.workers)]
+        visits = {}
+        self.playouts = 0
+        for future in futures:
+            counts, playouts, _ = future.result()
+            self.playouts += playouts
+            for move, count in counts.items():
+                visits[move] = visits.get(move, 0) + count
+        self.elapsed = time.perf_counter() - start
+        return best_visited(visits)
+
+    """
+    playouts_per_second()
+
+    return:
+    Playouts per second of wall-clock time over the last get_move() call, across all workers.
+    """
+    def playouts_per_second(self):
+        return self.playouts / self.elapsed if self.elapsed > 0 else 0.0
+
+    """
+    close()
+
+    functionality:
+    Shuts the worker processes down.
+
+    return:
+    None.
+    """
+    def close(self):
+        self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
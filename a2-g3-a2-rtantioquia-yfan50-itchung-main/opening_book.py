@@ -0,0 +1,212 @@
+#
+#   Builds and reads the opening book: the best move for every position in the first few plies of a game.
+#   To build it, run: python opening_book.py [plies] [tree_height] [output] [workers]
+#   (default: python opening_book.py 3 5 opening_book.bin)
+
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from a1_partd import apply_move
+from a2_partb import GameTree, MoveOrdering, ZOBRIST, copy_board, valid_moves
+from bench_a2_partb import start_board
+
+# Book file next to this module, loaded by the players if it exists
+DEFAULT_BOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")
+
+# File layout: header (magic, rows, cols, number of entries), then the entries sorted by key.
+# Each entry is the position's Zobrist hash, the player to move, and the move: 11 bytes.
+MAGIC = b"OBK1"
+HEADER = struct.Struct("<4sBBI")
+ENTRY = struct.Struct("<QbBB")
+
+
+"""
+OpeningBook class:
+maps (position, player to move) to a precomputed best move
+"""
+class OpeningBook:
+    """
+    OpeningBook.__init__(rows, cols, moves)
+
+    arguments:
+    rows, cols - Size of the board the book is for (default: 5x6).
+    moves - Optional dictionary mapping (hash, player) to (row, col).
+
+    return:
+    None.
+    """
+    def __init__(self, rows = 5, cols = 6, moves = None):
+        self.rows = rows
+        self.cols = cols
+        self.moves = moves or {}
+
+    def __len__(self):
+        return len(self.moves)
+
+    """
+    add(board, player, move)
+
+    functionality:
+    Records move as the book move for player on board.
+
+    return:
+    None.
+    """
+    def add(self, board, player, move):
+        self.moves[(ZOBRIST.hash_board(board), player)] = move
+
+    """
+    lookup(board, player)
+
+    arguments:
+    board - 2D list representing the current game board.
+    player - The player (1 or -1) to move.
+
+    functionality:
+    Finds the book move for the position. A move that is not valid on board (a board of another size,
+    or a hash collision) is never returned.
+
+    return:
+    Tuple (row, col), or None if the position is not in the book.
+    """
+    def lookup(self, board, player):
+        if len(board) != self.rows or len(board[0]) != self.cols:
+            return None
+        move = self.moves.get((ZOBRIST.hash_board(board), player))
+        if move is None:
+            return None
+        value = board[move[0]][move[1]]
+        if value != 0 and (value > 0) != (player > 0):
+            return None
+        return move
+
+    """
+    save(path) / OpeningBook.load(path)
+
+    functionality:
+    Writes the book in the compact binary layout described at the top of this file, or reads one back.
+    load raises ValueError if the file is not an opening book.
+    """
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.rows, self.cols, len(self.moves)))
+            for (key, player), (row, col) in sorted(self.moves.items()):
+                f.write(ENTRY.pack(key, player, row, col))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ValueError("not an opening book: {}".format(path))
+        magic, rows, cols, count = HEADER.unpack_from(data)
+        if magic != MAGIC or len(data) != HEADER.size + count * ENTRY.size:
+            raise ValueError("not an opening book: {}".format(path))
+        moves = {}
+        for key, player, row, col in ENTRY.iter_unpack(data[HEADER.size:]):
+            moves[(key, player)] = (row, col)
+        return cls(rows, cols, moves)
+
+
+"""
+load_default_book()
+
+return:
+The OpeningBook in DEFAULT_BOOK, or None if it has not been built.
+"""
+def load_default_book():
+    if not os.path.exists(DEFAULT_BOOK):
+        return None
+    return OpeningBook.load(DEFAULT_BOOK)
+
+
+"""
+book_positions(board, player, plies)
+
+arguments:
+board - 2D list of the position to start from.
+player - The player (1 or -1) to move there.
+plies - How many moves deep to go.
+
+functionality:
+Walks every sequence of up to plies - 1 valid moves from the position, so every position in
+which one of the first plies moves of a game is made is visited once. Positions reached by
+different move orders are only listed once.
+
+return:
+List of (board, player) pairs.
+"""
+def book_positions(board, player, plies):
+    positions = []
+    seen = set()
+    level = [(copy_board(board), player)]
+    for _ in range(plies):
+        next_level = []
+        for position, to_move in level:
+            key = (ZOBRIST.hash_board(position), to_move)
+            if key in seen:
+                continue
+            seen.add(key)
+            positions.append((position, to_move))
+            for i, j in valid_moves(position, to_move):
+                child = copy_board(position)
+                apply_move(child, i, j, to_move)
+                next_level.append((child, -to_move))
+        level = next_level
+    return positions
+
+
+def _book_move(board, player, tree_height):
+    return GameTree(board, player, tree_height, search="inplace", ordering=MoveOrdering(), symmetry=True).get_move()
+
+
+"""
+build_book(plies, tree_height, rows, cols, workers)
+
+arguments:
+plies - The book covers the first plies moves of a game (default: 3).
+tree_height - Height of the search run for each position (default: 5).
+rows, cols - Size of the board (default: 5x6).
+workers - Optional number of processes to search positions in.
+
+functionality:
+Searches every position of book_positions from the standard start position and records the move
+GameTree(board, player, tree_height).get_move() would make there.
+
+return:
+An OpeningBook.
+"""
+def build_book(plies = 3, tree_height = 5, rows = 5, cols = 6, workers = None):
+    positions = book_positions(start_board(rows, cols), 1, plies)
+    boards = [board for board, _ in positions]
+    players = [player for _, player in positions]
+    heights = [tree_height] * len(positions)
+    if workers:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            moves = list(pool.map(_book_move, boards, players, heights, chunksize=8))
+    else:
+        moves = list(map(_book_move, boards, players, heights))
+    book = OpeningBook(rows, cols)
+    for board, player, move in zip(boards, players, moves):
+        if move is not None:
+            book.add(board, player, move)
+    return book
+
+
+def main():
+    plies = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    tree_height = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    output = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_BOOK
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    start = time.perf_counter()
+    book = build_book(plies, tree_height, workers=workers)
+    book.save(output)
+    print("{} positions, {} bytes, {:.1f}s -> {}".format(
+        len(book), os.path.getsize(output), time.perf_counter() - start, output))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,100 @@
-from a2_partb import GameTree
+import time
+
+from a2_parta import TranspositionTable
+from a2_partb import AdaptiveDepth, GameTree, MoveOrdering, ParallelSearch, PlayRequests, PonderingSearch, ReusedSearch, SearchStats, TimeBank, iterative_deepening, search_stopped
+from opening_book import load_default_book
 
 class PlayerOne:
 
-    def __init__(self, name = "P1 Bot"):
+    # time_limit - seconds per move; time_bank - seconds for the whole game.
+    # With neither, a fixed tree_height search is used, split over `workers` processes if given,
+    # or carrying the tree over from the previous move if reuse_tree is set,
+    # or searching the likely replies in a background process during the opponent's turn if ponder is set.
+    # target_time / target_nodes - instead of always using tree_height, pick the deepest height expected to fit
+    # these per-move targets from the branching factor and the timings of earlier moves.
+    # Moves in the opening book (built with opening_book.py) are played without searching unless use_book is False.
+    def __init__(self, name = "P1 Bot", time_limit = None, time_bank = None, tree_height = 4, workers = None, reuse_tree = False, use_book = True, ponder = False, target_time = None, target_nodes = None):
         self.name = name
+        self.time_limit = time_limit
+        self.time_bank = None if time_bank is None else TimeBank(time_bank, time_limit)
+        self.tree_height = tree_height
+        self.parallel = None if workers is None else ParallelSearch(workers, tree_height)
+        self.reused = ReusedSearch(1, tree_height) if reuse_tree else None
+        self.pondering = PonderingSearch(1, tree_height) if ponder else None
+        self.book = load_default_book() if use_book else None
+        self.adaptive = None
+        if target_time is not None or target_nodes is not None:
+            self.adaptive = AdaptiveDepth(target_time, target_nodes)
+        # Background searches for request_play()
+        self.requests = PlayRequests(self.get_play)
         
     def get_name(self):
         return self.name
 
-    def get_play(self, board):
-        tree = GameTree(board, 1)
-        (row,col) = tree.get_move()
+    # With stats=True, returns ((row,col), SearchStats) so every move's search can be logged.
+    # cancel - optional threading.Event; once it is set the search raises a2_partb.SearchTimeout
+    # (a timed search returns its best move so far instead) and the bot's state is left as it was.
+    def get_play(self, board, stats = False, cancel = None):
+        search_stats = SearchStats() if stats else None
+        (row,col) = self.choose_move(board, search_stats, cancel)
+        if stats:
+            return (row,col), search_stats
+        return (row,col)
+
+    # Non-blocking get_play for a game loop: the search runs on a background thread and a
+    # concurrent.futures.Future for the move is returned straight away, so the caller can poll done().
+    # Only one search runs at a time; a new request cancels the one before it (see a2_partb.PlayRequests).
+    def request_play(self, board, stats = False):
+        return self.requests.submit(board, stats)
+
+    def cancel_play(self):
+        self.requests.cancel()
+
+    # Stops any search and shuts down the background thread and worker processes.
+    def close(self):
+        self.requests.close()
+        if self.parallel is not None:
+            self.parallel.close()
+        if self.pondering is not None:
+            self.pondering.close()
+
+    def choose_move(self, board, stats, cancel = None):
+        if self.book is not None:
+            move = self.book.lookup(board, 1)
+            if move is not None:
+                if stats is not None:
+                    stats.source = "book"
+                return move
+
+        if self.time_limit is None and self.time_bank is None:
+            if self.parallel is not None:
+                start = time.perf_counter()
+                (row,col) = self.parallel.get_move(board, 1)
+                if stats is not None:
+                    # The workers' searches are not instrumented, only the total time
+                    stats.source = "parallel"
+                    stats.finish(time.perf_counter() - start, 0, 0, 0)
+                return (row,col)
+            if self.reused is not None:
+                (row,col) = self.reused.get_move(board, stats, cancel)
+                return (row,col)
+            if self.pondering is not None:
+                (row,col) = self.pondering.get_move(board, stats, cancel)
+                return (row,col)
+            height = self.tree_height
+            if self.adaptive is not None:
+                height = self.adaptive.choose(board, 1)
+            start = time.perf_counter()
+            tree = GameTree(board, 1, height, search="inplace", ordering=MoveOrdering(), symmetry=True, stats=stats, cancel=cancel)
+            if self.adaptive is not None and not search_stopped(None, cancel):
+                self.adaptive.record(board, 1, height, tree.node_count, time.perf_counter() - start)
+            (row,col) = tree.get_move()
+            return (row,col)
+
+        start = time.perf_counter()
+        limit = self.time_limit if self.time_bank is None else self.time_bank.budget()
+        (row,col), _ = iterative_deepening(board, 1, limit, tt=TranspositionTable(), ordering=MoveOrdering(), stats=stats, cancel=cancel)
+        # A cancelled search's time is not charged to the game
+        if self.time_bank is not None and not search_stopped(None, cancel):
+            self.time_bank.spend(time.perf_counter() - start)
         return (row,col)
\ No newline at end of file
@@ -0,0 +1,47 @@
+from a2_partb import PlayRequests
+from mcts import MCTS, ParallelMCTS
+
+class PlayerMCTS:
+
+    # player - 1 or -1, the side this bot plays.
+    # playouts / time_limit - search budget per move; with neither, 1000 playouts are used.
+    # workers - run the playouts in that many processes (root parallel) instead of in this one.
+    # policy - "light" playouts prefer moves that overflow a cell, "random" ones are uniform.
+    def __init__(self, player = 1, name = "MCTS Bot", playouts = None, time_limit = None, workers = None, policy = "light"):
+        self.player = player
+        self.name = name
+        self.playouts = playouts
+        self.time_limit = time_limit
+        self.policy = policy
+        self.parallel = None if workers is None else ParallelMCTS(workers, playouts, time_limit, policy)
+        self.playouts_per_second = 0.0
+        # Background searches for request_play()
+        self.requests = PlayRequests(self.get_play)
+
+    def get_name(self):
+        return self.name
+
+    # cancel - optional threading.Event; once it is set the search stops early and its move should be ignored.
+    def get_play(self, board, cancel = None):
+        search = self.parallel
+        if search is not None:
+            (row,col) = search.get_move(board, self.player)
+        else:
+            search = MCTS(board, self.player, self.playouts, self.time_limit, self.policy, cancel=cancel)
+            (row,col) = search.get_move()
+        if cancel is None or not cancel.is_set():
+            self.playouts_per_second = search.playouts_per_second()
+        return (row,col)
+
+    # Non-blocking get_play for a game loop, as for PlayerOne / PlayerTwo (see a2_partb.PlayRequests).
+    def request_play(self, board):
+        return self.requests.submit(board)
+
+    def cancel_play(self):
+        self.requests.cancel()
+
+    # Stops any search and shuts down the background thread and worker processes.
+    def close(self):
+        self.requests.close()
+        if self.parallel is not None:
+            self.parallel.close()
@@ -0,0 +1,227 @@
+#
+#   These are the unit tests for the container variants added on top of a1_partc
+#   To use this, run: python test_a1_partc.py
+
+import gc
+import threading
+import unittest
+import weakref
+from queue import Empty, Full
+from a1_partc import Stack, Queue, Deque, MaskedQueue, MaskedDeque, TypedQueue, TypedDeque, CoordQueue, CoordDeque, BlockingQueue, QueueClosed
+
+class A1CTestCase(unittest.TestCase):
+    """These are the test cases for the container variants in a1_partc"""
+
+    def test_typed_queue(self):
+        q = TypedQueue(4)
+        for i in range(3):
+            q.enqueue(i)
+        self.assertEqual(q.dequeue(), 0)
+        self.assertEqual(q.dequeue(), 1)
+
+        # wrap around the end of the storage, then force a resize
+        for i in range(3, 9):
+            q.enqueue(i)
+        self.assertEqual(q.capacity(), 8)
+        self.assertEqual(len(q), 7)
+        self.assertEqual(q.get_front(), 2)
+
+        # segments() must cover the items in order without copying
+        values = []
+        for view in q.segments():
+            values.extend(view.tolist())
+        self.assertEqual(values, [2, 3, 4, 5, 6, 7, 8])
+
+        for i in range(2, 9):
+            self.assertEqual(q.dequeue(), i)
+        self.assertTrue(q.is_empty())
+        self.assertEqual(q.segments(), ())
+        self.assertRaises(IndexError, q.dequeue)
+
+    def test_typed_deque(self):
+        d = TypedDeque(4)
+        d.push_back(1)
+        d.push_front(0)
+        d.push_back(2)
+        self.assertEqual([d[i] for i in range(len(d))], [0, 1, 2])
+        self.assertEqual(len(d.segments()), 2)
+        d.compact()
+        self.assertEqual(len(d.segments()), 1)
+        self.assertEqual(d.segments()[0].tolist(), [0, 1, 2])
+        self.assertEqual(d.pop_back(), 2)
+        self.assertEqual(d.pop_front(), 0)
+        self.assertEqual(d.buffer().itemsize, d.items.itemsize)
+
+    def test_coord_containers(self):
+        q = CoordQueue(2)
+        for pair in [(0, 1), (2, 3), (4, 5)]:
+            q.enqueue(pair)
+        self.assertEqual(q.capacity(), 4)
+        self.assertEqual(q.dequeue(), (0, 1))
+        ((rows, cols),) = q.segments()
+        self.assertEqual(rows.tolist(), [2, 4])
+        self.assertEqual(cols.tolist(), [3, 5])
+
+        d = CoordDeque()
+        d.push_back((1, 1))
+        d.push_front((0, 0))
+        self.assertEqual(d.get_front(), (0, 0))
+        self.assertEqual(d.get_back(), (1, 1))
+        self.assertEqual(d[1], (1, 1))
+        self.assertEqual(d.pop_back(), (1, 1))
+
+    def test_blocking_queue(self):
+        q = BlockingQueue(maxsize=2)
+        q.put(1)
+        q.put(2)
+        self.assertRaises(Full, q.put, 3, timeout=0.01)
+        self.assertRaises(Full, q.put, 3, block=False)
+        self.assertEqual(q.get(), 1)
+        self.assertEqual(q.dequeue(), 2)
+        self.assertRaises(Empty, q.get, timeout=0.01)
+        self.assertRaises(IndexError, q.dequeue)
+
+        # a producer thread streams more items than fit at once
+        results = []
+        def produce():
+            for i in range(100):
+                q.put(i)
+            q.close()
+        worker = threading.Thread(target=produce)
+        worker.start()
+        while True:
+            try:
+                results.append(q.get(timeout=5))
+            except QueueClosed:
+                break
+        worker.join()
+        self.assertEqual(results, list(range(100)))
+        self.assertRaises(QueueClosed, q.put, 1)
+
+        # cancel discards queued items
+        q = BlockingQueue()
+        q.put(1)
+        q.cancel()
+        self.assertEqual(len(q), 0)
+        self.assertRaises(QueueClosed, q.get)
+
+    def test_deque_iteration_and_views(self):
+        d = Deque(6)
+        for i in range(4):
+            d.push_back(i)
+        d.push_front(-1)
+        d.push_front(-2)
+        expected = [-2, -1, 0, 1, 2, 3]
+        self.assertEqual(list(d), expected)
+        self.assertEqual(list(reversed(d)), expected[::-1])
+
+        # full deque rotates by moving the front index
+        d.rotate(2)
+        self.assertEqual(list(d), [2, 3, -2, -1, 0, 1])
+        d.rotate(-2)
+        self.assertEqual(list(d), expected)
+
+        d.pop_back()
+        expected.pop()
+        for k in range(-7, 8):
+            d.rotate(k)
+            shift = k % len(expected)
+            self.assertEqual(list(d), expected[-shift:] + expected[:-shift] if shift else expected)
+            d.rotate(-k)
+        self.assertEqual(list(reversed(d)), expected[::-1])
+
+        view = d.window(1, 4)
+        self.assertEqual(len(view), 3)
+        self.assertEqual(list(view), expected[1:4])
+        self.assertEqual(view[2], expected[3])
+        self.assertRaises(IndexError, view.__getitem__, 3)
+        self.assertEqual(list(d[2:]), expected[2:])
+        self.assertRaises(IndexError, d.window, 2, 9)
+
+    def test_masked_containers(self):
+        q = MaskedQueue(10)
+        self.assertEqual(q.capacity(), 16)
+        for i in range(40):
+            q.enqueue(i)
+            if i % 3 == 0:
+                self.assertEqual(q.dequeue(), i // 3)
+        self.assertEqual(q.capacity(), 32)
+        self.assertEqual(len(q), 26)
+        self.assertEqual(q.get_front(), 14)
+
+        d = MaskedDeque(3)
+        self.assertEqual(d.capacity(), 4)
+        for i in range(5):
+            d.push_front(i)
+            d.push_back(-i)
+        self.assertEqual(d.capacity(), 16)
+        self.assertEqual(list(d), [4, 3, 2, 1, 0, 0, -1, -2, -3, -4])
+        self.assertEqual(d[9], -4)
+        self.assertEqual(d.get_back(), -4)
+        self.assertEqual(d.pop_back(), -4)
+        self.assertEqual(d.pop_front(), 4)
+        self.assertEqual(list(d[1:3]), [2, 1])
+
+    def test_reference_release_and_shrink(self):
+        class Board(list):
+            pass
+
+        for container, add, remove in [(Stack(), 'push', 'pop'), (Queue(), 'enqueue', 'dequeue'),
+                                       (Deque(), 'push_back', 'pop_front'), (Deque(), 'push_front', 'pop_back'),
+                                       (MaskedQueue(), 'enqueue', 'dequeue'), (MaskedDeque(), 'push_back', 'pop_back')]:
+            board = Board([[0] * 6 for _ in range(5)])
+            ref = weakref.ref(board)
+            getattr(container, add)(board)
+            del board
+            getattr(container, remove)()
+            gc.collect()
+            self.assertIsNone(ref())
+
+        q = Queue(4, shrink=True)
+        for i in range(64):
+            q.enqueue(i)
+        self.assertEqual(q.capacity(), 64)
+        for i in range(60):
+            self.assertEqual(q.dequeue(), i)
+        self.assertEqual(q.capacity(), 8)
+        self.assertEqual([q.dequeue() for _ in range(4)], [60, 61, 62, 63])
+        self.assertEqual(q.capacity(), 4)
+
+        d = MaskedDeque(4, shrink=True)
+        for i in range(32):
+            d.push_back(i)
+        while len(d) > 1:
+            d.pop_back()
+        self.assertEqual(d.capacity(), 4)
+        self.assertEqual(list(d), [0])
+
+        # without the policy, capacity stays at its high-water mark
+        s = Stack(2)
+        for i in range(16):
+            s.push(i)
+        for i in range(16):
+            s.pop()
+        self.assertEqual(s.capacity(), 16)
+
+    def test_memory_usage(self):
+        q = Queue()
+        empty = q.memory_usage()
+        boards = [[[0] * 6 for _ in range(5)] for _ in range(3)]
+        for board in boards:
+            q.enqueue(board)
+        self.assertEqual(q.memory_usage(), empty)
+        self.assertGreater(q.memory_usage(deep=True), empty + 3 * 5 * 56)
+
+        self.assertLess(TypedQueue(1000).memory_usage(), Queue(1000).memory_usage())
+        self.assertLess(CoordDeque(1000).memory_usage(), Deque(1000).memory_usage())
+        t = TypedDeque(8, shrink=True)
+        for i in range(32):
+            t.push_back(i)
+        for i in range(30):
+            t.pop_front()
+        self.assertEqual(t.capacity(), 8)
+        self.assertEqual(list(t), [30, 31])
+
+
+if __name__ == '__main__':
+    unittest.main()
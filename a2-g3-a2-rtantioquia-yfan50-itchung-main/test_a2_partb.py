@@ -4,8 +4,33 @@
 #   To use this, run: python test_a2_partc.py
 
 
+import random
+import time
 import unittest
-from a2_partb import evaluate_board, GameTree
+from unittest import mock
+import a2_partb
+from a1_partc import Queue
+from a1_partd import overflow, apply_move
+from a2_parta import TranspositionTable
+from a2_partb import AdaptiveDepth, evaluate_board, evaluate_boards, EvalState, GameTree, SYMMETRIES, move_orbits, transform_board, MoveOrdering, ParallelSearch, PonderingSearch, ReusedSearch, SearchStats, SearchTimeout, ZOBRIST, TimeBank, iterative_deepening, valid_moves
+from player1 import PlayerOne
+
+
+def random_position(seed, plies, rows=5, cols=6):
+    # plays random valid moves from the standard start position and returns (board, player to move)
+    rng = random.Random(seed)
+    board = [[0] * cols for _ in range(rows)]
+    board[0][0] = 1
+    board[rows - 1][cols - 1] = -1
+    player = 1
+    for _ in range(plies):
+        moves = [(i, j) for i in range(rows) for j in range(cols)
+                 if board[i][j] == 0 or (board[i][j] > 0) == (player > 0)]
+        i, j = rng.choice(moves)
+        board[i][j] += player
+        overflow(board, Queue())
+        player = -player
+    return board, player
 
 class A2BTestCase(unittest.TestCase):
     """These are the test cases for functions and classes of a2"""
@@ -133,6 +158,477 @@ class A2BTestCase(unittest.TestCase):
         self.assertNotEqual((row,col), (4,0))
         self.assertNotEqual((row,col), (4,5))
 
+    def test_alphabeta_matches_minimax(self):
+        for seed in range(12):
+            board, player = random_position(seed, 4 + 2 * seed)
+            full = GameTree(board, player, 3)
+            pruned = GameTree(board, player, 3, search="alphabeta")
+            self.assertEqual(pruned.get_move(), full.get_move())
+            self.assertLessEqual(pruned.node_count, full.node_count)
+
+        board, player = random_position(99, 10)
+        full = GameTree(board, player)
+        pruned = GameTree(board, player, search="alphabeta")
+        self.assertEqual(pruned.get_move(), full.get_move())
+        self.assertEqual(pruned.root.score, full.root.score)
+
+    def test_iterative_deepening(self):
+        board, player = random_position(5, 12)
+        move, height = iterative_deepening(board, player, 60, max_height=3)
+        self.assertEqual(height, 3)
+        self.assertEqual(move, GameTree(board, player, 3).get_move())
+
+        # a tiny budget still returns a legal move
+        move, height = iterative_deepening(board, player, 0.0)
+        self.assertIn(move, valid_moves(board, player))
+        self.assertEqual(height, 0)
+
+        self.assertRaises(SearchTimeout, GameTree, board, player, 4, "alphabeta", 0.0)
+
+        # a budget well above what height 4 takes is used to reach height 4
+        for board, player in [random_position(0, 0), random_position(0, 2)]:
+            start = time.perf_counter()
+            GameTree(board, player, 4, search="alphabeta")
+            budget = max(0.25, 10 * (time.perf_counter() - start))
+            _, height = iterative_deepening(board, player, budget)
+            self.assertGreaterEqual(height, 4)
+            _, height = iterative_deepening(board, player, budget, tt=TranspositionTable(), ordering=MoveOrdering())
+            self.assertGreaterEqual(height, 4)
+
+    def test_time_bank(self):
+        bank = TimeBank(30, per_move_limit=2, expected_moves=20, min_moves_to_go=5)
+        self.assertAlmostEqual(bank.budget(), 1.5)
+        bank.spend(10)
+        self.assertAlmostEqual(bank.budget(), 20 / 19)
+        for _ in range(30):
+            bank.spend(0)
+        self.assertAlmostEqual(bank.budget(), 2)
+        bank.spend(25)
+        self.assertEqual(bank.budget(), 0)
+
+    def test_zobrist_and_transposition_table(self):
+        board, player = random_position(7, 16)
+        h = ZOBRIST.hash_board(board)
+        for i, j in valid_moves(board, player)[:10]:
+            child = [row[:] for row in board]
+            changes = []
+            apply_move(child, i, j, player, changes)
+            self.assertEqual(ZOBRIST.update(h, changes), ZOBRIST.hash_board(child))
+
+        tt = TranspositionTable()
+        for seed in range(6):
+            board, player = random_position(seed, 8 + seed)
+            plain = GameTree(board, player, 3, search="alphabeta")
+            cached = GameTree(board, player, 3, search="alphabeta", tt=tt)
+            self.assertEqual(cached.get_move(), plain.get_move())
+            # searching again with the filled table reuses the stored results
+            again = GameTree(board, player, 3, search="alphabeta", tt=tt)
+            self.assertEqual(again.get_move(), plain.get_move())
+            self.assertLess(again.node_count, plain.node_count)
+        self.assertGreater(tt.hit_rate(), 0)
+        self.assertLessEqual(tt.hits, tt.probes)
+
+    def test_move_ordering(self):
+        visited = [0, 0]
+        for seed in range(10):
+            board, player = random_position(seed, 6 + seed)
+            plain = GameTree(board, player, 4, search="alphabeta")
+            ordering = MoveOrdering()
+            ordered = GameTree(board, player, 4, search="alphabeta", ordering=ordering)
+            self.assertEqual(ordered.get_move(), plain.get_move())
+            self.assertEqual(ordered.root.score, plain.root.score)
+            visited[0] += plain.node_count
+            visited[1] += ordered.node_count
+        self.assertLess(visited[1], visited[0])
+
+        # killers keep the two newest moves per depth
+        ordering = MoveOrdering()
+        for move in [(0, 0), (1, 1), (0, 0), (2, 2)]:
+            ordering.cutoff(1, move, 2)
+        self.assertEqual(ordering.killers[1], [(2, 2), (0, 0)])
+        self.assertEqual(ordering.history[(0, 0)], 8)
+
+    def test_parallel_search(self):
+        with ParallelSearch(workers=3, tree_height=3) as search:
+            for seed in range(4):
+                board, player = random_position(seed, 5 + 3 * seed)
+                self.assertEqual(search.get_move(board, player), GameTree(board, player, 3).get_move())
+            board, player = random_position(11, 9)
+            self.assertEqual(search.get_move(board, player, 4), GameTree(board, player, 4).get_move())
+
+        board, player = random_position(3, 7)
+        moves = valid_moves(board, player)[::2]
+        tree = GameTree(board, player, 2, root_moves=moves)
+        self.assertEqual([child.move for child in tree.root.children], moves)
+
+    def test_reused_search(self):
+        for search in ["minimax", "alphabeta"]:
+            board, player = random_position(21, 6)
+            reused = ReusedSearch(player, 3, search=search)
+            rng = random.Random(5)
+            for turn in range(4):
+                move = reused.get_move(board)
+                self.assertEqual(move, GameTree(board, player, 3).get_move())
+                # play our move and a random reply
+                apply_move(board, move[0], move[1], player)
+                reply = rng.choice(valid_moves(board, -player))
+                apply_move(board, reply[0], reply[1], -player)
+            self.assertGreater(reused.reused_nodes, 0)
+
+    def test_inplace_search(self):
+        for seed in range(8):
+            board, player = random_position(seed, 3 + 3 * seed)
+            before = [row[:] for row in board]
+            expected = GameTree(board, player, 3).get_move()
+            self.assertEqual(GameTree(board, player, 3, search="inplace").get_move(), expected)
+            tree = GameTree(board, player, 3, search="inplace", ordering=MoveOrdering())
+            self.assertEqual(tree.get_move(), expected)
+            self.assertEqual(board, before)
+
+        board, player = random_position(42, 12)
+        full = GameTree(board, player)
+        tree = GameTree(board, player, search="inplace", ordering=MoveOrdering())
+        self.assertEqual(tree.get_move(), full.get_move())
+        self.assertEqual(tree.root.score, full.root.score)
+        # only the root's children are kept
+        self.assertTrue(all(not child.children for child in tree.root.children))
+
+
+    def test_incremental_eval_state(self):
+        board, player = random_position(17, 20)
+        state = EvalState(board)
+        for move in valid_moves(board, player):
+            changes = []
+            child = [row[:] for row in board]
+            apply_move(child, move[0], move[1], player, changes)
+            state.update(changes)
+            fresh = EvalState(child)
+            self.assertEqual((state.p1_total, state.p2_total, state.p1_cells, state.p2_cells),
+                             (fresh.p1_total, fresh.p2_total, fresh.p1_cells, fresh.p2_cells))
+            for perspective in [1, -1]:
+                self.assertEqual(state.score(perspective), evaluate_board(child, perspective))
+            state.revert(changes)
+        self.assertEqual(EvalState([[0, 2], [1, 0]]).winner(), 1)
+        self.assertEqual(EvalState([[0, -2], [-1, 0]]).winner(), -1)
+        self.assertEqual(EvalState([[0, -2], [1, 0]]).winner(), 0)
+
+    def test_symmetry(self):
+        # mirror images share a canonical hash
+        board, player = random_position(5, 12)
+        canonical = min(ZOBRIST.hash_symmetric(board))
+        for symmetry in SYMMETRIES:
+            self.assertEqual(min(ZOBRIST.hash_symmetric(transform_board(board, symmetry))), canonical)
+
+        # a board that is its own 180 degree turn: each root move is searched once per mirrored pair
+        board = [[0] * 6 for _ in range(5)]
+        board[0][0] = board[4][5] = 1
+        board[0][5] = board[4][0] = -1
+        board[2][2] = board[2][3] = 2
+        orbits = move_orbits(board, valid_moves(board, 1))
+        self.assertEqual(len(orbits), 14)
+        self.assertEqual(orbits[(0, 0)], [(4, 5)])
+        full = GameTree(board, 1, 4)
+        reduced = GameTree(board, 1, 4, symmetry=True)
+        self.assertLess(reduced.node_count, full.node_count)
+        self.assertEqual(sorted((c.move, c.score) for c in reduced.root.children),
+                         sorted((c.move, c.score) for c in full.root.children))
+        for search in ["alphabeta", "inplace"]:
+            tree = GameTree(board, 1, 4, search=search, ordering=MoveOrdering(), symmetry=True)
+            self.assertEqual(tree.get_move(), full.get_move())
+
+        # canonical transposition table keys do not change the chosen move
+        for seed in range(10):
+            board, player = random_position(seed, 6 + seed)
+            expected = GameTree(board, player, 4).get_move()
+            tree = GameTree(board, player, 4, search="alphabeta", tt=TranspositionTable(), ordering=MoveOrdering(), symmetry=True)
+            self.assertEqual(tree.get_move(), expected)
+
+    def test_terminal_positions(self):
+        # (0, 0) wipes out player 2 straight away
+        board = [[0] * 6 for _ in range(5)]
+        board[0][0] = 1
+        board[0][1] = -1
+        board[3][3] = 1
+        for search in ["minimax", "alphabeta", "inplace"]:
+            ordering = None if search == "minimax" else MoveOrdering()
+            tree = GameTree(board, 1, 4, search=search, ordering=ordering)
+            self.assertGreater(tree.terminal_count, 0)
+            self.assertGreaterEqual(tree.terminal_skipped, tree.terminal_count)
+        # one ply from the leaves, the estimate is exactly the moves that were not expanded
+        tree = GameTree(board, 1, 3)
+        finished = [child for child in tree.root.children if child.terminal]
+        self.assertEqual(tree.terminal_skipped, sum(len(valid_moves(child.board, child.player)) for child in finished))
+        # the immediate win is taken at odd heights too, where the leaves are scored for the opponent
+        # (on a smaller board, so the full height 5 trees stay quick)
+        small = [[1, -1, 0, 0],
+                 [0, 0, 0, 0],
+                 [0, 0, 1, 0]]
+        for height in [3, 5]:
+            for search in ["minimax", "alphabeta", "streaming", "inplace"]:
+                ordering = None if search in ["minimax", "streaming"] else MoveOrdering()
+                tree = GameTree(small, 1, height, search=search, ordering=ordering)
+                self.assertEqual(tree.get_move(), (0, 0))
+                self.assertEqual(tree.root.score, 100)
+        self.assertEqual(PlayerOne(use_book=False, tree_height=3).get_play(board), (0, 0))
+        tree = GameTree(board, 1, 4)
+        finished = [child for child in tree.root.children if child.terminal]
+        self.assertTrue(finished)
+        for child in finished:
+            self.assertEqual(child.children, [])
+            self.assertEqual(child.score, 100)
+
+        # late in a game many branches end early, and every engine still agrees
+        for seed in range(12):
+            board, player = random_position(seed, 40 + seed)
+            expected = GameTree(board, player, 4)
+            for search in ["alphabeta", "inplace"]:
+                tree = GameTree(board, player, 4, search=search, ordering=MoveOrdering())
+                self.assertEqual(tree.get_move(), expected.get_move())
+
+    def check_batch_leaf_evaluation(self):
+        boards = [[[0, 0], [0, 0]], [[1, 0], [0, 0]], [[0, -3], [0, 0]], [[2, -1], [0, 1]], [[1, -4], [0, 2]]]
+        for seed in range(20):
+            boards.append(random_position(seed, 3 + 3 * seed)[0])
+        for player in [1, -1]:
+            same_size = [board for board in boards if len(board) == 2]
+            self.assertEqual(evaluate_boards(same_size, player), [evaluate_board(board, player) for board in same_size])
+            same_size = [board for board in boards if len(board) == 5]
+            self.assertEqual(evaluate_boards(same_size, player), [evaluate_board(board, player) for board in same_size])
+        self.assertEqual(evaluate_boards([], 1), [])
+
+        # leaves scored in one batch back up to the same scores as scoring each leaf on its own
+        board, player = random_position(8, 14)
+        tree = GameTree(board, player, 4)
+        self.assertEqual(tree.get_move(), GameTree(board, player, 4, search="inplace").get_move())
+
+    def test_batch_leaf_evaluation(self):
+        # the per-board fallback used when NumPy is missing
+        with mock.patch.object(a2_partb, "np", None):
+            self.check_batch_leaf_evaluation()
+
+    @unittest.skipUnless(a2_partb.np is not None, "NumPy is not installed")
+    def test_batch_leaf_evaluation_numpy(self):
+        self.check_batch_leaf_evaluation()
+
+    def test_pondering(self):
+        board, player = random_position(4, 8)
+        with PonderingSearch(player, 3) as search:
+            move = search.get_move(board)
+            self.assertEqual(move, GameTree(board, player, 3).get_move())
+            self.assertEqual(search.ponder_misses, 1)
+            self.assertTrue(search.pending)
+
+            # the opponent plays one of the pondered replies
+            apply_move(board, move[0], move[1], player)
+            reply = GameTree(board, -player, 2, search="inplace").get_move()
+            apply_move(board, reply[0], reply[1], -player)
+            self.assertEqual(search.get_move(board), GameTree(board, player, 3).get_move())
+            self.assertEqual(search.ponder_hits, 1)
+
+            # a position nobody pondered is searched on the spot
+            other, _ = random_position(5, 9)
+            self.assertEqual(search.get_move(other), GameTree(other, player, 3).get_move())
+            self.assertEqual(search.ponder_misses, 2)
+
+    def test_search_stats(self):
+        board, player = random_position(3, 10)
+        stats = SearchStats()
+        tree = GameTree(board, player, 4, stats=stats)
+        self.assertEqual(stats.node_count(), tree.node_count)
+        self.assertEqual(stats.nodes_per_depth[0], 1)
+        self.assertEqual(stats.leaves, stats.nodes_per_depth[3])
+        self.assertEqual(stats.peak_nodes, tree.node_count)
+        self.assertAlmostEqual(sum(stats.time.values()), stats.total_time)
+        branching = stats.effective_branching_factor()
+        self.assertAlmostEqual(branching + branching ** 2 + branching ** 3, tree.node_count - 1, places=3)
+
+        for search in ["alphabeta", "inplace"]:
+            stats = SearchStats()
+            tree = GameTree(board, player, 4, search=search, ordering=MoveOrdering(), stats=stats)
+            self.assertEqual(tree.get_move(), GameTree(board, player, 4).get_move())
+            self.assertGreater(stats.cutoffs, 0)
+            self.assertEqual(stats.cutoffs, tree.cutoff_count)
+            self.assertGreater(stats.leaves, 0)
+            self.assertGreater(stats.nodes_per_second(), 0)
+            self.assertEqual(set(stats.as_dict()["time"]), set(SearchStats.PHASES))
+
+        # the players hand the stats back with the move
+        bot = PlayerOne(use_book=False)
+        move, stats = bot.get_play(board, stats=True)
+        self.assertEqual(move, bot.get_play(board))
+        self.assertEqual(stats.source, "search")
+        self.assertGreater(stats.node_count(), 1)
+        start = [[0] * 6 for _ in range(5)]
+        start[0][0] = 1
+        start[4][5] = -1
+        move, stats = PlayerOne().get_play(start, stats=True)
+        self.assertEqual(stats.source, "book")
+
+    def test_adaptive_depth(self):
+        start, _ = random_position(0, 0)
+        crowded, player = random_position(6, 40)
+        # an untouched board: 29 moves for player 1, then 29 for player 2
+        depth = AdaptiveDepth(target_nodes=1000)
+        self.assertEqual(depth.full_tree_size(start, 1, 3), 1 + 29 + 29 * 29)
+        self.assertEqual(depth.choose(start, 1), 3)
+        self.assertEqual(AdaptiveDepth(target_nodes=500).choose(start, 1), 2)
+
+        depth = AdaptiveDepth(target_nodes=2000)
+        tree = GameTree(start, 1, 4, search="inplace", ordering=MoveOrdering())
+        depth.record(start, 1, 4, tree.node_count, 0.01)
+        self.assertLess(depth.visited_share[4], 1)
+        self.assertEqual(depth.nodes_per_second, tree.node_count / 0.01)
+        nodes, seconds = depth.estimate(start, 1, 4)
+        self.assertAlmostEqual(nodes, tree.node_count)
+        self.assertAlmostEqual(seconds, 0.01)
+        self.assertGreaterEqual(depth.choose(start, 1), 4)
+
+        # a time target stays shallow until it has a timing to go on, and never goes below min_height
+        depth = AdaptiveDepth(target_time=1.0, min_height=3)
+        self.assertEqual(depth.choose(crowded, player), 3)
+        depth.record(crowded, player, 3, 100, 0.001)
+        self.assertGreater(depth.choose(crowded, player), 3)
+        self.assertLessEqual(depth.choose(crowded, player), depth.max_height)
+
+    def test_ranked_moves(self):
+        for seed in range(8):
+            board, player = random_position(seed, 5 + 2 * seed)
+            full = GameTree(board, player, 4)
+            ranking = full.ranked_moves()
+            self.assertEqual(len(ranking), len(full.root.children))
+            self.assertEqual(ranking[0][0], full.get_move())
+            # worked out once and kept on the tree
+            self.assertIs(full.ranking[0], full.ranked_moves(1)[0])
+            expected = [(move, score) for move, score, _ in ranking[:3]]
+            for search in ["alphabeta", "inplace"]:
+                tree = GameTree(board, player, 4, search=search, ordering=MoveOrdering(), multi_pv=3)
+                self.assertEqual(tree.get_move(), full.get_move())
+                top = tree.ranked_moves()
+                self.assertEqual([(move, score) for move, score, _ in top], expected)
+                # each principal variation is a line of valid moves, starting with its move
+                for move, _, pv in top:
+                    self.assertEqual(pv[0], move)
+                    self.assertLessEqual(len(pv), 3)
+                    line = [row[:] for row in board]
+                    to_move = player
+                    for step in pv:
+                        self.assertIn(step, valid_moves(line, to_move))
+                        apply_move(line, step[0], step[1], to_move)
+                        to_move = -to_move
+
+    def test_streaming_search(self):
+        for seed in range(8):
+            board, player = random_position(seed, 3 + 3 * seed)
+            full = GameTree(board, player, 4)
+            tree = GameTree(board, player, 4, search="streaming")
+            self.assertEqual(tree.get_move(), full.get_move())
+            self.assertEqual(tree.root.score, full.root.score)
+            self.assertEqual(tree.node_count, full.node_count)
+            self.assertEqual([child.score for child in tree.root.children],
+                             [child.score for child in full.root.children])
+            # subtrees are dropped once scored
+            self.assertTrue(all(not child.children for child in tree.root.children))
+
+        board, player = random_position(3, 8)
+        stats = SearchStats()
+        tree = GameTree(board, player, 4, search="streaming", stats=stats)
+        self.assertEqual(stats.node_count(), tree.node_count)
+        self.assertEqual(stats.peak_nodes, 1 + len(tree.root.children) + 2)
+
+    def test_merge_duplicates(self):
+        # (0, 3) and (1, 3) both overflow into exactly the same board
+        board = [[1, 2, 2, -2, 2, 1],
+                 [-2, -3, -3, -3, 3, 2],
+                 [0, -2, -2, 3, 1, 1],
+                 [-2, -2, 3, 1, 3, 1],
+                 [0, -1, 2, 2, 0, 1]]
+        first = [row[:] for row in board]
+        second = [row[:] for row in board]
+        apply_move(first, 0, 3, -1)
+        apply_move(second, 1, 3, -1)
+        self.assertEqual(first, second)
+
+        full = GameTree(board, -1, 3)
+        scores = {child.move: child.score for child in full.root.children}
+        for search in ["minimax", "alphabeta", "streaming"]:
+            stats = SearchStats()
+            tree = GameTree(board, -1, 3, search=search, stats=stats, merge_duplicates=True)
+            self.assertEqual(tree.get_move(), full.get_move())
+            self.assertGreaterEqual(tree.duplicate_count, 1)
+            self.assertEqual(stats.duplicate_moves, tree.duplicate_count)
+            self.assertLess(tree.node_count, full.node_count)
+            self.assertEqual(tree.duplicates[(1, 3)], (0, 3))
+            merged = {child.move: child for child in tree.root.children}
+            self.assertEqual(sorted(merged), sorted(scores))
+            self.assertIn((1, 3), merged[(0, 3)].duplicate_moves)
+            self.assertEqual(merged[(1, 3)].score, merged[(0, 3)].score)
+            if search != "alphabeta":
+                self.assertEqual(merged[(1, 3)].score, scores[(1, 3)])
+        self.assertEqual(tree.principal_variation(merged[(1, 3)])[0], (1, 3))
+
+        # without merge_duplicates nothing is merged
+        self.assertEqual(full.duplicate_count, 0)
+        self.assertEqual(GameTree(board, -1, 3, search="inplace", merge_duplicates=True).get_move(), full.get_move())
+
+    def test_request_play(self):
+        board, _ = random_position(5, 10)
+        bot = PlayerOne(use_book=False)
+        expected = bot.get_play(board)
+        first = bot.request_play(board)
+        second = bot.request_play(board)
+        # the second request replaced the first
+        self.assertIs(bot.requests.request, second)
+        self.assertEqual(second.result(timeout=60), expected)
+        self.assertTrue(first.cancelled() or first.done())
+
+        move, stats = bot.request_play(board, stats=True).result(timeout=60)
+        self.assertEqual(move, expected)
+        self.assertGreater(stats.node_count(), 1)
+        # the board can change while the bot is thinking
+        future = bot.request_play(board)
+        board[0][0] = 0
+        self.assertEqual(future.result(timeout=60), expected)
+        bot.cancel_play()
+        self.assertIsNone(bot.requests.request)
+
+    def test_cancel_request_play(self):
+        board, _ = random_position(5, 10)
+        # a search far too deep to finish is stopped, and the next request does not wait for it
+        bot = PlayerOne(use_book=False, tree_height=9)
+        slow = bot.request_play(board)
+        time.sleep(0.2)
+        start = time.perf_counter()
+        bot.cancel_play()
+        self.assertIsInstance(slow.exception(timeout=5), SearchTimeout)
+        bot.tree_height = 3
+        self.assertEqual(bot.request_play(board).result(timeout=5), GameTree(board, 1, 3, search="inplace").get_move())
+        self.assertLess(time.perf_counter() - start, 2)
+
+        # a cancelled timed search leaves the time bank untouched
+        bot = PlayerOne(use_book=False, time_limit=30, time_bank=60)
+        request = bot.request_play(board)
+        time.sleep(0.2)
+        bot.cancel_play()
+        self.assertIn(request.result(timeout=5), valid_moves(board, 1))
+        self.assertEqual(bot.time_bank.remaining, 60)
+
+        # so does a cancelled adaptive search, and a new request still works
+        bot = PlayerOne(use_book=False, tree_height=9)
+        bot.adaptive = AdaptiveDepth(target_time=1.0, min_height=9, max_height=9)
+        request = bot.request_play(board)
+        time.sleep(0.2)
+        bot.cancel_play()
+        self.assertIsInstance(request.exception(timeout=5), SearchTimeout)
+        self.assertIsNone(bot.adaptive.nodes_per_second)
+
+        # closing the bot stops its search instead of waiting for it
+        bot = PlayerOne(use_book=False, tree_height=9)
+        request = bot.request_play(board)
+        time.sleep(0.2)
+        start = time.perf_counter()
+        bot.close()
+        self.assertLess(time.perf_counter() - start, 2)
+        self.assertTrue(request.done())
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,63 @@
+#
+#   These are the unit tests for the Monte Carlo search bot
+#   To use this, run: python test_mcts.py
+
+import time
+import unittest
+from a2_partb import valid_moves
+from bench_a2_partb import start_board
+from mcts import MCTS, ParallelMCTS
+from player_mcts import PlayerMCTS
+
+
+class MCTSTestCase(unittest.TestCase):
+
+    def test_finds_winning_move(self):
+        board = [[0] * 6 for _ in range(5)]
+        board[0][0] = 1
+        board[0][1] = -1
+        board[3][3] = 1
+        for policy in ["random", "light"]:
+            tree = MCTS(board, 1, playouts=300, policy=policy, seed=3)
+            self.assertEqual(tree.get_move(), (0, 0))
+
+    def test_budget_and_statistics(self):
+        board = start_board()
+        tree = MCTS(board, 1, playouts=200, seed=1)
+        move = tree.get_move()
+        self.assertIn(move, valid_moves(board, 1))
+        self.assertEqual(tree.playouts, 200)
+        self.assertEqual(tree.root.visits, 200)
+        self.assertEqual(sum(tree.root_visits().values()), 200)
+        self.assertGreater(tree.playouts_per_second(), 0)
+        # same seed, same search
+        self.assertEqual(MCTS(board, 1, playouts=200, seed=1).get_move(), move)
+
+    def test_deadline(self):
+        tree = MCTS(start_board(), -1, time_limit=0.2)
+        tree.search()
+        self.assertGreater(tree.playouts, 0)
+        self.assertLess(tree.elapsed, 1.0)
+
+    def test_parallel_and_player(self):
+        board = start_board()
+        with ParallelMCTS(2, playouts=100) as search:
+            self.assertIn(search.get_move(board, 1), valid_moves(board, 1))
+            self.assertEqual(search.playouts, 100)
+        bot = PlayerMCTS(-1, playouts=50)
+        self.assertIn(bot.get_play(board), valid_moves(board, -1))
+        self.assertGreater(bot.playouts_per_second, 0)
+
+        # the game loop's non-blocking API; a cancelled search stops straight away
+        self.assertIn(bot.request_play(board).result(timeout=30), valid_moves(board, -1))
+        bot = PlayerMCTS(-1, time_limit=60)
+        request = bot.request_play(board)
+        time.sleep(0.1)
+        start = time.perf_counter()
+        bot.close()
+        self.assertLess(time.perf_counter() - start, 5)
+        self.assertTrue(request.done())
+
+
+if __name__ == '__main__':
+    unittest.main()
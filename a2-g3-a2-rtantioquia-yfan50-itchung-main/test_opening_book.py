@@ -0,0 +1,52 @@
+#
+#   These are the unit tests for the opening book
+#   To use this, run: python test_opening_book.py
+
+import os
+import tempfile
+import unittest
+from a2_partb import GameTree, valid_moves
+from opening_book import OpeningBook, book_positions, build_book, start_board
+
+
+class OpeningBookTestCase(unittest.TestCase):
+
+    def test_positions(self):
+        board = start_board()
+        positions = book_positions(board, 1, 2)
+        self.assertEqual(len(positions), 1 + len(valid_moves(board, 1)))
+        self.assertEqual(positions[0], (board, 1))
+        self.assertTrue(all(player == -1 for _, player in positions[1:]))
+
+    def test_build_save_load(self):
+        book = build_book(plies=2, tree_height=3)
+        self.assertEqual(len(book), len(book_positions(start_board(), 1, 2)))
+        for board, player in book_positions(start_board(), 1, 2):
+            self.assertEqual(book.lookup(board, player), GameTree(board, player, 3).get_move())
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "book.bin")
+            book.save(path)
+            self.assertEqual(os.path.getsize(path), 10 + 11 * len(book))
+            loaded = OpeningBook.load(path)
+            self.assertEqual(loaded.moves, book.moves)
+
+            with open(path, "wb") as f:
+                f.write(b"not a book")
+            with self.assertRaises(ValueError):
+                OpeningBook.load(path)
+
+    def test_lookup(self):
+        book = OpeningBook()
+        board = start_board()
+        book.add(board, 1, (4, 5))
+        # the stored move belongs to the opponent, so it is not played
+        self.assertIsNone(book.lookup(board, 1))
+        book.add(board, 1, (0, 0))
+        self.assertEqual(book.lookup(board, 1), (0, 0))
+        self.assertIsNone(book.lookup(board, -1))
+        self.assertIsNone(book.lookup(start_board(6, 6), 1))
+
+
+if __name__ == '__main__':
+    unittest.main()